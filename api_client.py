@@ -1,16 +1,73 @@
+import gzip
+import json
+import os
+import sys
+import threading
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import httpx
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+EVENTS_TIMEOUT = httpx.Timeout(10.0, read=60.0)
+MAX_CONCURRENT_REQUESTS = 8
+DEFAULT_BASE_URL = "http://127.0.0.1:8000/api/v1"
+
+MSGPACK_TYPE = "application/msgpack"
+COMPRESS_MIN_BYTES = 1024
+# Коди, якими сервер може відхилити стиснене або MessagePack тіло запиту
+BODY_REJECTED_CODES = (400, 415, 422)
+USER_STATS_BATCH_SIZE = 200
+# Сервер без пакетного /users/stats/ може відповісти 404/405, а якщо маршрут
+# /users/{id} перехопить "stats" як id - то 422
+BATCH_UNSUPPORTED_CODES = (404, 405, 422, 501)
+_NO_BODY = object()
+
 
 class APIClient:
-    def __init__(self, base_url: str = "http://127.0.0.1:8000/api/v1"):
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, **client_kwargs):
         self.base_url = base_url
+        # Додаткові параметри httpx.Client (event_hooks, verify, limits тощо)
+        self.client_kwargs = client_kwargs
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
-        self.client = httpx.Client(base_url=base_url, timeout=10.0)
         self.user_role: Optional[str] = None
+        self._client: Optional[httpx.Client] = None
+        # gzip для великих тіл запитів; MessagePack вмикається, лише коли
+        # сервер сам відповів у цьому форматі
+        self.compress_requests = True
+        self.msgpack_requests = False
+        # Сервер відхилив закодоване тіло, а звичайний JSON прийняв - після
+        # цього відповіді у MessagePack вже не вмикають його для запитів
+        self.encoded_bodies_rejected = False
+        self.batch_user_stats = True
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        # Створення httpx.Client (SSL-контекст) відкладене до першого запиту,
+        # щоб імпорт модуля залишався дешевим для CLI
+        if self._client is None:
+            self._client = httpx.Client(
+                base_url=self.base_url, timeout=10.0, **self.client_kwargs
+            )
+            if self.access_token:
+                self._client.headers["Authorization"] = f"Bearer {self.access_token}"
+            # Accept-Encoding (gzip, а також br/zstd за наявності декодерів)
+            # httpx додає сам, тут узгоджується лише формат тіла
+            if msgpack is not None:
+                self._client.headers["Accept"] = f"{MSGPACK_TYPE}, application/json;q=0.9"
+        return self._client
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
     def set_tokens(self, access: str, refresh: str = None):
         self.access_token = access
@@ -18,19 +75,115 @@ class APIClient:
             self.refresh_token = refresh
         self.client.headers["Authorization"] = f"Bearer {access}"
 
+    def save_session(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "base_url": self.base_url,
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "user_role": self.user_role,
+        }
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as fp:
+            json.dump(data, fp)
+
+    def load_session(self, path: str) -> bool:
+        try:
+            with open(path) as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return False
+        if data.get("base_url") != self.base_url or not data.get("access_token"):
+            return False
+
+        self.refresh_token = data.get("refresh_token")
+        self.user_role = data.get("user_role")
+        self.access_token = data["access_token"]
+        if self._client is not None:
+            self._client.headers["Authorization"] = f"Bearer {self.access_token}"
+        return True
+
+    def _fan_out(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Паралельні запити з обмеженням кількості одночасних з'єднань
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+            return list(pool.map(fn, items))
+
+    def _fan_out_unordered(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Any]:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        # Результати віддаються в порядку завершення; якщо споживач зупинився,
+        # ще не розпочаті запити скасовуються
+        pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+        try:
+            futures = [pool.submit(fn, item) for item in items]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _decode(self, response: httpx.Response) -> Any:
+        content_type = response.headers.get("Content-Type", "")
+        if msgpack is not None and content_type.startswith(
+            (MSGPACK_TYPE, "application/x-msgpack")
+        ):
+            if not self.encoded_bodies_rejected:
+                self.msgpack_requests = True
+            return msgpack.unpackb(response.content)
+        return response.json()
+
+    def _encode(self, payload: Any) -> Tuple[bytes, Dict[str, str]]:
+        if self.msgpack_requests:
+            body = msgpack.packb(payload)
+            headers = {"Content-Type": MSGPACK_TYPE}
+        else:
+            body = json.dumps(payload, separators=(",", ":")).encode()
+            headers = {"Content-Type": "application/json"}
+
+        if self.compress_requests and len(body) >= COMPRESS_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        return body, headers
+
+    def _send(self, method: str, url: str, payload: Any, **kwargs) -> httpx.Response:
+        if payload is _NO_BODY:
+            return self.client.request(method, url, **kwargs)
+        body, headers = self._encode(payload)
+        headers = {**kwargs.pop("headers", {}), **headers}
+        return self.client.request(method, url, content=body, headers=headers, **kwargs)
+
     def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        payload = kwargs.pop("json", _NO_BODY)
         try:
-            response = self.client.request(method, url, **kwargs)
+            response = self._send(method, url, payload, **kwargs)
+            sent = response.request.headers
+            if response.status_code in BODY_REJECTED_CODES and (
+                "Content-Encoding" in sent or sent.get("Content-Type") == MSGPACK_TYPE
+            ):
+                # Повторюємо запит звичайним JSON; якщо це допомогло - сервер
+                # не підтримує стиснення/MessagePack, і далі їх не використовуємо
+                encoding = (self.compress_requests, self.msgpack_requests)
+                self.compress_requests = self.msgpack_requests = False
+                retry = self._send(method, url, payload, **kwargs)
+                if retry.status_code in BODY_REJECTED_CODES:
+                    self.compress_requests, self.msgpack_requests = encoding
+                else:
+                    self.encoded_bodies_rejected = True
+                response = retry
+
             if response.status_code == 401 and self.refresh_token:
-                print("Token expired. Refreshing...")
-                if self.refresh_session():
-                    self.client.headers["Authorization"] = f"Bearer {self.access_token}"
-                    return self.client.request(method, url, **kwargs)
+                print("Token expired. Refreshing...", file=sys.stderr)
+                sent_token = response.request.headers.get("Authorization", "")
+                if self.refresh_session(sent_token.removeprefix("Bearer ")):
+                    response = self._send(method, url, payload, **kwargs)
 
             response.raise_for_status()
             return response
         except httpx.HTTPError as e:
-            print(f"API Error [{method} {url}]: {e}")
+            print(f"API Error [{method} {url}]: {e}", file=sys.stderr)
             raise e
 
     def login(self, username, password) -> bool:
@@ -39,14 +192,14 @@ class APIClient:
                 "/auth/login", data={"username": username, "password": password}
             )
             response.raise_for_status()
-            data = response.json()
+            data = self._decode(response)
             self.set_tokens(data["access_token"], data.get("refresh_token"))
 
             me = self.get_me()
             self.user_role = me.get("role", "user")
             return True
         except Exception as e:
-            print(f"Login failed: {e}")
+            print(f"Login failed: {e}", file=sys.stderr)
             return False
 
     def register(self, username, email, password) -> bool:
@@ -56,38 +209,51 @@ class APIClient:
                 json={"username": username, "email": email, "password": password},
             )
             response.raise_for_status()
-            data = response.json()
+            data = self._decode(response)
             self.set_tokens(data["access_token"], data.get("refresh_token"))
             self.user_role = "user"
             return True
         except Exception as e:
-            print(f"Registration failed: {e}")
+            print(f"Registration failed: {e}", file=sys.stderr)
             return False
 
-    def refresh_session(self) -> bool:
-        try:
-            temp_client = httpx.Client(base_url=self.base_url)
-            temp_client.headers["Authorization"] = f"Bearer {self.refresh_token}"
-            response = temp_client.post("/auth/refresh")
-            response.raise_for_status()
-            data = response.json()
-            self.set_tokens(data["access_token"], data.get("refresh_token"))
-            return True
-        except Exception:
-            return False
+    def refresh_session(self, stale_token: Optional[str] = None) -> bool:
+        # Паралельні запити отримують 401 одночасно, а сервер може видавати
+        # новий refresh-токен при кожному оновленні, тож оновлює лише перший
+        # потік; решта після очікування бачать, що токен уже змінився
+        with self._refresh_lock:
+            if stale_token is not None and self.access_token != stale_token:
+                return True
+            try:
+                response = self.client.post(
+                    "/auth/refresh",
+                    headers={"Authorization": f"Bearer {self.refresh_token}"},
+                )
+                response.raise_for_status()
+                data = self._decode(response)
+                self.set_tokens(data["access_token"], data.get("refresh_token"))
+                return True
+            except Exception:
+                return False
 
     def get_me(self) -> Dict[str, Any]:
-        return self._request("GET", "/auth/users/me").json()
+        return self._decode(self._request("GET", "/auth/users/me"))
+
+    # fetch_* кидають httpx.HTTPError, get_* повертають порожній результат
+    def fetch_tasks(self) -> List[Dict[str, Any]]:
+        return self._decode(self._request("GET", "/tasks/"))
 
     def get_tasks(self) -> List[Dict[str, Any]]:
         try:
-            return self._request("GET", "/tasks/").json()
+            return self.fetch_tasks()
         except Exception:
             return []
 
-    def create_task(self, title: str, description: str = None) -> bool:
+    def create_task(
+        self, title: str, description: str = None
+    ) -> Optional[Dict[str, Any]]:
         try:
-            self._request(
+            response = self._request(
                 "POST",
                 "/tasks/",
                 json={
@@ -95,9 +261,9 @@ class APIClient:
                     "description": description,
                 },
             )
-            return True
+            return self._decode(response)
         except Exception:
-            return False
+            return None
 
     def update_task(self, task_id: int, title: str, description: str) -> bool:
         try:
@@ -122,40 +288,86 @@ class APIClient:
         except Exception:
             return False
 
-    def get_task_logs(
+    def delete_tasks(self, task_ids: List[int]) -> List[int]:
+        results = self._fan_out(self.delete_task, task_ids)
+        return [task_id for task_id, ok in zip(task_ids, results) if ok]
+
+    def fetch_task_logs(
         self, task_id: int, date_from: date = None
     ) -> List[Dict[str, Any]]:
         params = {}
         if date_from:
             params["date_from"] = date_from.isoformat()
+        response = self._request("GET", f"/tasks/{task_id}/logs", params=params)
+        return self._decode(response)
+
+    def get_task_logs(
+        self, task_id: int, date_from: date = None
+    ) -> List[Dict[str, Any]]:
         try:
-            return self._request("GET", f"/tasks/{task_id}/logs", params=params).json()
+            return self.fetch_task_logs(task_id, date_from)
         except Exception:
             return []
 
+    def get_logs_for_tasks(
+        self, task_ids: List[int], date_from: date = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        def fetch(task_id):
+            try:
+                return self.fetch_task_logs(task_id, date_from)
+            except Exception:
+                return None
+
+        # Задачі, для яких запит не вдався, не потрапляють у результат
+        results = zip(task_ids, self._fan_out(fetch, task_ids))
+        return {task_id: logs for task_id, logs in results if logs is not None}
+
+    def sync(
+        self,
+        new_logs: List[Dict[str, Any]] = None,
+        created_tasks: List[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        payload = {
+            "created_tasks": created_tasks or [],
+            "new_logs": new_logs or [],
+        }
+        return self._decode(self._request("POST", "/sync/", json=payload))
+
+    def complete_tasks(self, task_ids: List[int], log_date: date) -> bool:
+        # Один /sync/ запит на всі задачі замість окремого на кожну
+        try:
+            self.sync(
+                new_logs=[
+                    {"task_id": task_id, "date": log_date.isoformat(), "status": True}
+                    for task_id in task_ids
+                ]
+            )
+            return True
+        except Exception as e:
+            print(f"Bulk complete error: {e}", file=sys.stderr)
+            return False
+
     def set_log_status(self, task_id: int, log_date: date, status: bool) -> bool:
         try:
             if status:
-                payload = {
-                    "created_tasks": [],
-                    "new_logs": [
+                self.sync(
+                    new_logs=[
                         {
                             "task_id": task_id,
                             "date": log_date.isoformat(),
                             "status": True,
                         }
-                    ],
-                }
-                self._request("POST", "/sync/", json=payload)
+                    ]
+                )
             else:
                 self._request(
                     "DELETE",
-                    f"/taclsks/{task_id}/complete",
+                    f"/tasks/{task_id}/complete",
                     params={"date": log_date.isoformat()},
                 )
             return True
         except Exception as e:
-            print(f"Set log status error: {e}")
+            print(f"Set log status error: {e}", file=sys.stderr)
             return False
 
     def toggle_today(self, task_id: int, current_status: bool) -> bool:
@@ -163,9 +375,68 @@ class APIClient:
 
     def get_all_users(self) -> List[Dict[str, Any]]:
         try:
-            return self._request("GET", "/users/").json()
+            return self._decode(self._request("GET", "/users/"))
         except Exception:
             return []
 
+    def get_user_stats(self, user_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            return self._decode(self._request("GET", f"/users/{user_id}/stats"))
+        except Exception:
+            return None
+
+    def iter_user_stats(self, user_ids: List[int]) -> Iterator[Dict[str, Any]]:
+        # Спершу пакетний endpoint частинами по USER_STATS_BATCH_SIZE; якщо сервер
+        # його не підтримує - окремий запит на користувача з обмеженою паралельністю
+        pending = list(user_ids)
+        while pending and self.batch_user_stats:
+            chunk = pending[:USER_STATS_BATCH_SIZE]
+            try:
+                response = self._request(
+                    "GET", "/users/stats/", params={"ids": ",".join(map(str, chunk))}
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in BATCH_UNSUPPORTED_CODES:
+                    raise
+                self.batch_user_stats = False
+                break
+            yield from self._decode(response)
+            pending = pending[USER_STATS_BATCH_SIZE:]
+
+        for stats in self._fan_out_unordered(self.get_user_stats, pending):
+            if stats is not None:
+                yield stats
+
+    def stream_events(
+        self, client: Optional[httpx.Client] = None
+    ) -> Iterator[Dict[str, Any]]:
+        # Server-Sent Events: кожна подія - це блок рядків "event:"/"data:",
+        # завершений порожнім рядком. Рядки, що починаються з ":", - keep-alive.
+        client = client or httpx.Client(base_url=self.base_url, timeout=EVENTS_TIMEOUT)
+        with client:
+            for attempt in range(2):
+                token = self.access_token
+                headers = {"Accept": "text/event-stream", "Authorization": f"Bearer {token}"}
+                with client.stream("GET", "/events/", headers=headers) as response:
+                    if response.status_code == 401 and attempt == 0:
+                        if self.refresh_token and self.refresh_session(token):
+                            continue
+                    response.raise_for_status()
+                    yield {"type": "open", "data": {}}
 
-api = APIClient()
\ No newline at end of file
+                    event_type, data_lines = "message", []
+                    for line in response.iter_lines():
+                        if not line:
+                            if data_lines:
+                                yield {
+                                    "type": event_type,
+                                    "data": json.loads("\n".join(data_lines)),
+                                }
+                            event_type, data_lines = "message", []
+                        elif line.startswith(":"):
+                            continue
+                        elif line.startswith("event:"):
+                            event_type = line[6:].strip()
+                        elif line.startswith("data:"):
+                            data_lines.append(line[5:].lstrip())
+                    return
@@ -9,13 +9,15 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from api_client import api
+from api_client import DEFAULT_BASE_URL
+from sessions import Session
 
 
 class AuthWindow(QDialog):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.setWindowTitle("Welcome")
+        self.session = None
         self.resize(300, 250)
         self.layout = QVBoxLayout(self)
 
@@ -32,11 +34,13 @@ class AuthWindow(QDialog):
         u = QLineEdit()
         p = QLineEdit()
         p.setEchoMode(QLineEdit.Password)
+        s = QLineEdit(DEFAULT_BASE_URL)
         l.addRow("Username", u)
         l.addRow("Password", p)
+        l.addRow("Server", s)
 
         btn_login = QPushButton("Login")
-        btn_login.clicked.connect(lambda: self.do_login(u.text(), p.text()))
+        btn_login.clicked.connect(lambda: self.do_login(u.text(), p.text(), s.text()))
 
         btn_reg = QPushButton("Create Account")
         btn_reg.setFlat(True)
@@ -55,12 +59,16 @@ class AuthWindow(QDialog):
         e = QLineEdit()
         p = QLineEdit()
         p.setEchoMode(QLineEdit.Password)
+        s = QLineEdit(DEFAULT_BASE_URL)
         l.addRow("Username", u)
         l.addRow("Email", e)
         l.addRow("Password", p)
+        l.addRow("Server", s)
 
         btn_reg = QPushButton("Register")
-        btn_reg.clicked.connect(lambda: self.do_register(u.text(), e.text(), p.text()))
+        btn_reg.clicked.connect(
+            lambda: self.do_register(u.text(), e.text(), p.text(), s.text())
+        )
 
         btn_back = QPushButton("Back to Login")
         btn_back.setFlat(True)
@@ -76,14 +84,20 @@ class AuthWindow(QDialog):
             if item.widget():
                 item.widget().deleteLater()
 
-    def do_login(self, u, p):
-        if api.login(u, p):
+    def do_login(self, u, p, server):
+        session = Session(server.strip() or DEFAULT_BASE_URL, u)
+        if session.api.login(u, p):
+            self.session = session
             self.accept()
         else:
+            session.close()
             QMessageBox.warning(self, "Error", "Invalid credentials")
 
-    def do_register(self, u, e, p):
-        if api.register(u, e, p):
+    def do_register(self, u, e, p, server):
+        session = Session(server.strip() or DEFAULT_BASE_URL, u)
+        if session.api.register(u, e, p):
+            self.session = session
             self.accept()
         else:
+            session.close()
             QMessageBox.warning(self, "Error", "Registration failed")
\ No newline at end of file
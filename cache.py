@@ -0,0 +1,153 @@
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+HISTORY_DAYS = 364
+USER_STATS_TTL = 300
+
+
+def log_date(log: Dict[str, Any]) -> str:
+    return log["date"].split("T")[0]
+
+
+def current_streak(dates: Set[str], today: Optional[date] = None) -> int:
+    check = today or date.today()
+    if check.isoformat() not in dates:
+        check -= timedelta(days=1)
+
+    streak = 0
+    while check.isoformat() in dates:
+        streak += 1
+        check -= timedelta(days=1)
+    return streak
+
+
+class TTLCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entries: Dict[Any, Tuple[float, Any]] = {}
+
+    def get(self, key: Any) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            self.entries.pop(key, None)
+            return None
+        return entry[1]
+
+    def set(self, key: Any, value: Any):
+        self.entries[key] = (time.monotonic(), value)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class HabitCache:
+    def __init__(self):
+        self.tasks: Dict[int, Dict[str, Any]] = {}
+        self.logs: Dict[int, Set[str]] = {}
+        # Кількість виконаних звичок за кожен день - оновлюється інкрементально
+        self.day_counts: Counter = Counter()
+        self.tasks_loaded = False
+        # Активність користувачів для панелі адміністратора
+        self.user_stats = TTLCache(USER_STATS_TTL)
+
+    def set_tasks(self, tasks: Iterable[Dict[str, Any]]):
+        self.tasks = {t["id"]: t for t in tasks}
+        self.tasks_loaded = True
+        for task_id in list(self.logs):
+            if task_id not in self.tasks:
+                self._drop_logs(task_id)
+
+    def invalidate(self):
+        self.tasks_loaded = False
+        self.logs.clear()
+        self.day_counts.clear()
+
+    def upsert_task(self, task: Dict[str, Any]):
+        if task["id"] in self.tasks:
+            self.tasks[task["id"]].update(task)
+        else:
+            self.tasks[task["id"]] = task
+
+    def remove_task(self, task_id: int):
+        self.tasks.pop(task_id, None)
+        self._drop_logs(task_id)
+
+    def has_logs(self, task_id: int) -> bool:
+        return task_id in self.logs
+
+    def missing_logs(self) -> List[int]:
+        return [task_id for task_id in self.tasks if task_id not in self.logs]
+
+    def set_logs(self, task_id: int, logs: Iterable[Dict[str, Any]]):
+        self._drop_logs(task_id)
+        dates = {log_date(l) for l in logs if l.get("status", True)}
+        self.logs[task_id] = dates
+        self.day_counts.update(dates)
+
+    def set_log(self, task_id: int, date_str: str, status: bool):
+        task = self.tasks.get(task_id)
+        if task is not None and date_str == date.today().isoformat():
+            task["is_completed"] = status
+
+        # Поки історію задачі не завантажено, окремий лог її не відновить
+        dates = self.logs.get(task_id)
+        if dates is None or (date_str in dates) == status:
+            return
+        if status:
+            dates.add(date_str)
+            self.day_counts[date_str] += 1
+        else:
+            dates.discard(date_str)
+            self.day_counts[date_str] -= 1
+
+    def apply_event(self, event: Dict[str, Any]):
+        data = event["data"]
+        event_type = event["type"]
+        if event_type in ("task_created", "task_updated"):
+            self.upsert_task(data)
+        elif event_type == "task_deleted":
+            self.remove_task(data["id"])
+        elif event_type in ("log_created", "log_deleted"):
+            status = event_type == "log_created" and data.get("status", True)
+            self.set_log(data["task_id"], log_date(data), status)
+
+    def completion_rate(self, days: int, today: Optional[date] = None) -> float:
+        if not self.tasks or days <= 0:
+            return 0.0
+        today = today or date.today()
+        done = sum(
+            self.day_counts[(today - timedelta(days=i)).isoformat()]
+            for i in range(days)
+        )
+        return done / (len(self.tasks) * days)
+
+    def daily_levels(self) -> Dict[str, float]:
+        total = len(self.tasks)
+        if not total:
+            return {}
+        return {d: min(c / total, 1.0) for d, c in self.day_counts.items() if c > 0}
+
+    def task_streak(self, task_id: int) -> int:
+        return current_streak(self.logs.get(task_id, set()))
+
+    def task_rate(self, task_id: int) -> float:
+        return len(self.logs.get(task_id, ())) / HISTORY_DAYS
+
+    def top_streaks(self, limit: int = 5) -> List[Tuple[Dict[str, Any], int]]:
+        today = date.today()
+        streaks = [
+            (self.tasks[task_id], current_streak(dates, today))
+            for task_id, dates in self.logs.items()
+            if task_id in self.tasks
+        ]
+        streaks.sort(key=lambda item: item[1], reverse=True)
+        return [item for item in streaks[:limit] if item[1] > 0]
+
+    def _drop_logs(self, task_id: int):
+        dates = self.logs.pop(task_id, None)
+        if dates:
+            self.day_counts.subtract(dates)
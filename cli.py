@@ -0,0 +1,149 @@
+"""Консольний клієнт HabitTasks без залежності від Qt.
+
+    python cli.py login alice
+    python cli.py list
+    python cli.py done 3 7
+    echo "3 2024-05-01" | python cli.py done -
+    python cli.py log 3 --date 2024-05-01 --undo
+    python cli.py stats 3
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+import httpx
+
+from api_client import DEFAULT_BASE_URL, APIClient
+from cache import HISTORY_DAYS, current_streak, log_date
+
+SESSION_FILE = os.path.join(os.path.expanduser("~"), ".habit-tasks", "session.json")
+
+
+def cmd_login(api: APIClient, args) -> int:
+    import getpass
+
+    password = args.password or getpass.getpass()
+    if not api.login(args.username, password):
+        return 1
+    print(f"Logged in as {args.username}")
+    return 0
+
+
+# list і stats використовують fetch_*: get_tasks/get_task_logs повертають []
+# при помилці, і невдалий запит виглядав би як порожній результат
+def cmd_list(api: APIClient, args) -> int:
+    for task in api.fetch_tasks():
+        mark = "x" if task["is_completed"] else " "
+        print(f"[{mark}] {task['id']:>5}  {task['title']}")
+    return 0
+
+
+def parse_batch(lines):
+    # Кожен рядок: "<task_id> [YYYY-MM-DD]", порожні рядки та "#" ігноруються
+    for line in lines:
+        parts = line.split("#", 1)[0].split()
+        if not parts:
+            continue
+        log_day = date.fromisoformat(parts[1]) if len(parts) > 1 else date.today()
+        yield int(parts[0]), log_day
+
+
+def cmd_done(api: APIClient, args) -> int:
+    if args.task_ids in ([], ["-"]):
+        entries = list(parse_batch(sys.stdin))
+    else:
+        entries = [(int(task_id), date.today()) for task_id in args.task_ids]
+    if not entries:
+        return 0
+
+    try:
+        api.sync(
+            new_logs=[
+                {"task_id": task_id, "date": log_day.isoformat(), "status": True}
+                for task_id, log_day in entries
+            ]
+        )
+    except Exception:
+        return 1
+    print(f"Logged {len(entries)} completions")
+    return 0
+
+
+def cmd_log(api: APIClient, args) -> int:
+    log_day = date.fromisoformat(args.date) if args.date else date.today()
+    return 0 if api.set_log_status(args.task_id, log_day, not args.undo) else 1
+
+
+def cmd_stats(api: APIClient, args) -> int:
+    year_ago = date.today() - timedelta(days=HISTORY_DAYS)
+    logs = api.fetch_task_logs(args.task_id, date_from=year_ago)
+    dates = {log_date(l) for l in logs if l.get("status", True)}
+    print(f"Current streak:    {current_streak(dates)}")
+    print(f"Total completions: {len(dates)}")
+    print(f"Win rate (year):   {int(len(dates) / HISTORY_DAYS * 100)}%")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="habit-tasks")
+    parser.add_argument(
+        "--server", default=os.environ.get("HABIT_TASKS_SERVER", DEFAULT_BASE_URL)
+    )
+    parser.add_argument(
+        "--session", default=os.environ.get("HABIT_TASKS_SESSION", SESSION_FILE)
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    login = commands.add_parser("login", help="log in and store the session")
+    login.add_argument("username")
+    login.add_argument("--password")
+    login.set_defaults(handler=cmd_login)
+
+    commands.add_parser("list", help="list habits").set_defaults(handler=cmd_list)
+
+    done = commands.add_parser(
+        "done", help="complete habits today; '-' or no ids reads stdin"
+    )
+    done.add_argument("task_ids", nargs="*")
+    done.set_defaults(handler=cmd_done)
+
+    log = commands.add_parser("log", help="set or clear a completion for a date")
+    log.add_argument("task_id", type=int)
+    log.add_argument("--date")
+    log.add_argument("--undo", action="store_true")
+    log.set_defaults(handler=cmd_log)
+
+    stats = commands.add_parser("stats", help="show habit statistics")
+    stats.add_argument("task_id", type=int)
+    stats.set_defaults(handler=cmd_stats)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    api = APIClient(args.server)
+
+    if args.command != "login" and not api.load_session(args.session):
+        print("Not logged in. Run: habit-tasks login <username>", file=sys.stderr)
+        return 2
+
+    try:
+        code = args.handler(api, args)
+    except ValueError as e:
+        print(f"Invalid input: {e}", file=sys.stderr)
+        return 1
+    except httpx.HTTPError:
+        # Подробиці вже виведено в stderr з APIClient
+        code = 1
+
+    # Токени могли оновитися під час запиту
+    if api.access_token:
+        api.save_session(args.session)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
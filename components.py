@@ -1,9 +1,10 @@
 from datetime import date, timedelta
-from typing import Set
+from typing import Dict, Optional, Set
 
 from PySide6.QtCore import Qt, Signal, QRect
 from PySide6.QtGui import QBrush, QColor, QPainter, QPen, QFont
 from PySide6.QtWidgets import (
+    QCheckBox,
     QFrame,
     QHBoxLayout,
     QLabel,
@@ -12,7 +13,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from api_client import api
+from sessions import api, cache
 from constants import COLOR_ACCENT, COLOR_BG_CARD, COLOR_BG_EMPTY, COLOR_TEXT_DIM
 
 
@@ -21,7 +22,8 @@ class YearHeatmap(QWidget):
 
     def __init__(self, logs, interactive=False, parent=None):
         super().__init__(parent)
-        self.completed_dates: Set[str] = {log["date"].split("T")[0] for log in logs}
+        self.completed_dates: Set[str] = set()
+        self.levels: Optional[Dict[str, float]] = None
         self.interactive = interactive
 
         # 7 рядків для днів тижня
@@ -44,13 +46,37 @@ class YearHeatmap(QWidget):
 
         self.setFixedSize(width + 10, height + 10)
 
-        self.end_date = date.today()
-        self.start_date = self.end_date - timedelta(days=self.total_days - 1)
+        self.set_logs(logs)
 
         if self.interactive:
             self.setCursor(Qt.PointingHandCursor)
             self.setToolTip("Click on a cell to toggle status")
 
+    def set_logs(self, logs):
+        self.completed_dates = {log["date"].split("T")[0] for log in logs}
+        self.end_date = date.today()
+        self.start_date = self.end_date - timedelta(days=self.total_days - 1)
+        self.update()
+
+    def set_levels(self, levels: Dict[str, float]):
+        # Режим інтенсивності: частка виконаних звичок за день від 0 до 1
+        self.levels = levels
+        self.set_logs([{"date": d} for d in levels])
+
+    def cell_color(self, date_str: str) -> QColor:
+        if date_str not in self.completed_dates:
+            return QColor(COLOR_BG_EMPTY)
+        if self.levels is None:
+            return QColor(COLOR_ACCENT)
+
+        empty, full = QColor(COLOR_BG_EMPTY), QColor(COLOR_ACCENT)
+        k = 0.25 + 0.75 * self.levels[date_str]
+        return QColor(
+            int(empty.red() + (full.red() - empty.red()) * k),
+            int(empty.green() + (full.green() - empty.green()) * k),
+            int(empty.blue() + (full.blue() - empty.blue()) * k),
+        )
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -91,14 +117,7 @@ class YearHeatmap(QWidget):
                 # Зміщуємо сітку вниз на висоту заголовка
                 y = row * (self.cell_size + self.spacing) + self.header_height
 
-                date_str = current_date.isoformat()
-                is_completed = date_str in self.completed_dates
-
-                if is_completed:
-                    bg_color = QColor(COLOR_ACCENT)
-                else:
-                    bg_color = QColor(COLOR_BG_EMPTY)
-
+                bg_color = self.cell_color(current_date.isoformat())
                 painter.setBrush(QBrush(bg_color))
 
                 if current_date == date.today():
@@ -133,9 +152,31 @@ class YearHeatmap(QWidget):
                 self.dateClicked.emit(clicked_date)
 
 
+class StatCard(QFrame):
+    def __init__(self, title, value="0"):
+        super().__init__()
+        self.setStyleSheet(
+            f"background-color: {COLOR_BG_CARD}; border-radius: 8px; padding: 10px;"
+        )
+        l = QVBoxLayout(self)
+        t = QLabel(title)
+        t.setStyleSheet(f"color: {COLOR_TEXT_DIM}; font-size: 12px;")
+        self.value = QLabel(value)
+        self.value.setStyleSheet(
+            f"color: {COLOR_ACCENT}; font-size: 20px; font-weight: bold;"
+        )
+        self.value.setAlignment(Qt.AlignCenter)
+        l.addWidget(t)
+        l.addWidget(self.value)
+
+    def set_value(self, value):
+        self.value.setText(value)
+
+
 class HabitCard(QFrame):
     needsRefresh = Signal()
     cardClicked = Signal(dict)
+    selectionChanged = Signal()
 
     def __init__(self, task_data):
         super().__init__()
@@ -156,11 +197,16 @@ class HabitCard(QFrame):
 
         header = QHBoxLayout()
 
+        self.chk_select = QCheckBox()
+        self.chk_select.setVisible(False)
+        self.chk_select.toggled.connect(self.selectionChanged)
+        header.addWidget(self.chk_select)
+
         text_layout = QVBoxLayout()
-        title = QLabel(task_data["title"])
-        title.setStyleSheet("font-size: 16px; font-weight: bold; color: white;")
+        self.title = QLabel(task_data["title"])
+        self.title.setStyleSheet("font-size: 16px; font-weight: bold; color: white;")
 
-        text_layout.addWidget(title)
+        text_layout.addWidget(self.title)
 
         self.btn_check = QPushButton()
         self.btn_check.setFixedSize(40, 40)
@@ -180,18 +226,46 @@ class HabitCard(QFrame):
         layout.addLayout(self.preview_layout)
 
     def mouseReleaseEvent(self, event):
-        if not self.btn_check.underMouse():
+        if self.chk_select.isVisible():
+            # У режимі вибору клік по картці перемикає виділення
+            if not self.chk_select.underMouse():
+                self.chk_select.toggle()
+        elif not self.btn_check.underMouse():
             self.cardClicked.emit(self.task_data)
         super().mouseReleaseEvent(event)
 
+    def set_selectable(self, selectable: bool):
+        self.chk_select.setVisible(selectable)
+        if not selectable:
+            self.chk_select.setChecked(False)
+
+    def is_selected(self) -> bool:
+        return self.chk_select.isChecked()
+
     def load_mini_preview(self):
         pass
 
+    def update_data(self, task_data):
+        self.task_data.update(task_data)
+        self.title.setText(self.task_data["title"])
+        self.set_completed(self.task_data["is_completed"])
+
+    def set_completed(self, completed: bool):
+        self.task_data["is_completed"] = completed
+        self.btn_check.setChecked(completed)
+        self.update_btn_style()
+
     def on_check_click(self):
         success = api.toggle_today(self.task_data["id"], self.task_data["is_completed"])
         if success:
             self.task_data["is_completed"] = not self.task_data["is_completed"]
+            cache.set_log(
+                self.task_data["id"],
+                date.today().isoformat(),
+                self.task_data["is_completed"],
+            )
             self.update_btn_style()
+            self.needsRefresh.emit()
         else:
             self.btn_check.setChecked(self.task_data["is_completed"])
 
@@ -4,4 +4,11 @@ COLOR_BG_CARD = "#263238"
 COLOR_TEXT_DIM = "#b0bec5"
 
 WINDOW_WIDTH = 1120
-WINDOW_HEIGHT = 600
\ No newline at end of file
+WINDOW_HEIGHT = 600
+LIVE_RECONNECT_DELAY_MS = 5000
+STATS_FLUSH_INTERVAL_MS = 200
+PROGRESS_INTERVAL_MS = 100
+VIEW_UPDATE_DELAY_MS = 50
+
+EXPORT_FILTERS = {"CSV (*.csv)": ".csv", "Packed binary (*.htpk)": ".htpk"}
+EXPORT_FILTER = ";;".join(EXPORT_FILTERS)
@@ -0,0 +1,411 @@
+"""Локальний stand-in сервер HabitTasks API для розробки та перевірки клієнта.
+
+Зберігає все в пам'яті. Запуск: python dev_server.py --port 8000
+"""
+
+import argparse
+import gzip
+import json
+import queue
+import re
+import secrets
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+API_PREFIX = "/api/v1"
+KEEPALIVE_SECONDS = 15
+MSGPACK_TYPE = "application/msgpack"
+COMPRESS_MIN_BYTES = 1024
+
+
+class State:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}
+        self.tokens = {}
+        self.refresh_tokens = {}
+        self.tasks = {}
+        self.logs = {}
+        self.subscribers = {}
+        self.next_user_id = 1
+        self.next_task_id = 1
+
+    def create_user(self, username, email, password):
+        with self.lock:
+            if any(u["username"] == username for u in self.users.values()):
+                return None
+            user = {
+                "id": self.next_user_id,
+                "username": username,
+                "email": email,
+                "password": password,
+                "role": "admin" if username == "admin" else "user",
+            }
+            self.users[user["id"]] = user
+            self.next_user_id += 1
+            return user
+
+    def find_user(self, username, password):
+        with self.lock:
+            for user in self.users.values():
+                if user["username"] == username and user["password"] == password:
+                    return user
+        return None
+
+    def issue_tokens(self, user_id):
+        access = secrets.token_hex(16)
+        refresh = secrets.token_hex(16)
+        with self.lock:
+            self.tokens[access] = user_id
+            self.refresh_tokens[refresh] = user_id
+        return {"access_token": access, "refresh_token": refresh, "token_type": "bearer"}
+
+    def add_task(self, user_id, title, description=None):
+        with self.lock:
+            task = {
+                "id": self.next_task_id,
+                "title": title,
+                "description": description,
+                "user_id": user_id,
+            }
+            self.tasks[task["id"]] = task
+            self.next_task_id += 1
+            view = self.task_view(task)
+        self.publish(user_id, "task_created", view)
+        return view
+
+    def task_view(self, task):
+        today = date.today().isoformat()
+        view = {k: v for k, v in task.items()}
+        view["is_completed"] = today in self.logs.get(task["id"], set())
+        return view
+
+    def user_tasks(self, user_id):
+        with self.lock:
+            return [
+                self.task_view(t) for t in self.tasks.values() if t["user_id"] == user_id
+            ]
+
+    def activity(self, user_id):
+        today = date.today()
+        week_ago = (today - timedelta(days=7)).isoformat()
+        month_ago = (today - timedelta(days=30)).isoformat()
+        with self.lock:
+            task_ids = [t["id"] for t in self.tasks.values() if t["user_id"] == user_id]
+            dates = [d for task_id in task_ids for d in self.logs.get(task_id, ())]
+        return {
+            "user_id": user_id,
+            "task_count": len(task_ids),
+            "completed_7d": sum(d > week_ago for d in dates),
+            "completed_30d": sum(d > month_ago for d in dates),
+            "last_active": max(dates, default=None),
+        }
+
+    def publish(self, user_id, event_type, data):
+        with self.lock:
+            subscribers = list(self.subscribers.get(user_id, ()))
+        for q in subscribers:
+            q.put((event_type, data))
+
+    def subscribe(self, user_id):
+        q = queue.Queue()
+        with self.lock:
+            self.subscribers.setdefault(user_id, []).append(q)
+        return q
+
+    def unsubscribe(self, user_id, q):
+        with self.lock:
+            self.subscribers.get(user_id, []).remove(q)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Заголовки й тіло відповіді пишуться окремо; з Nagle кожен запит
+    # чекав би на затримане підтвердження клієнта (~40 мс)
+    disable_nagle_algorithm = True
+    state: State = None
+    # Імітація сервера лише з JSON без стиснення - для перевірки fallback клієнта
+    plain = False
+
+    routes = [
+        ("POST", r"/auth/login", "login"),
+        ("POST", r"/auth/register", "register"),
+        ("POST", r"/auth/refresh", "refresh"),
+        ("GET", r"/auth/users/me", "me"),
+        ("GET", r"/tasks/", "list_tasks"),
+        ("POST", r"/tasks/", "create_task"),
+        ("PATCH", r"/tasks/(\d+)", "update_task"),
+        ("DELETE", r"/tasks/(\d+)", "delete_task"),
+        ("GET", r"/tasks/(\d+)/logs", "task_logs"),
+        ("DELETE", r"/tasks/(\d+)/complete", "uncomplete"),
+        ("POST", r"/sync/", "sync"),
+        ("GET", r"/users/", "list_users"),
+        ("GET", r"/users/stats/", "users_stats"),
+        ("GET", r"/users/(\d+)/stats", "user_stats"),
+        ("GET", r"/events/", "events"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else None
+        self.query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        encoded = self.headers.get("Content-Encoding") == "gzip"
+        packed = self.headers.get("Content-Type") == MSGPACK_TYPE
+        if (encoded or packed) and (self.plain or (packed and msgpack is None)):
+            return self.send_json({"detail": "Unsupported Media Type"}, 415)
+        if encoded:
+            self.body = gzip.decompress(self.body)
+
+        for route_method, pattern, name in self.routes:
+            match = re.fullmatch(pattern, path or "")
+            if match and route_method == method:
+                return getattr(self, name)(*(int(g) for g in match.groups()))
+        self.send_json({"detail": "Not Found"}, 404)
+
+    def send_json(self, payload, status=200):
+        accept = self.headers.get("Accept", "")
+        if msgpack is not None and not self.plain and MSGPACK_TYPE in accept:
+            body, content_type = msgpack.packb(payload), MSGPACK_TYPE
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        accept_encoding = self.headers.get("Accept-Encoding", "")
+        if not self.plain and "gzip" in accept_encoding and len(body) >= COMPRESS_MIN_BYTES:
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def json_body(self):
+        if self.headers.get("Content-Type") == MSGPACK_TYPE:
+            return msgpack.unpackb(self.body)
+        return json.loads(self.body or b"{}")
+
+    def current_user(self):
+        auth = self.headers.get("Authorization", "")
+        user_id = self.state.tokens.get(auth.removeprefix("Bearer "))
+        if user_id is None:
+            self.send_json({"detail": "Not authenticated"}, 401)
+            return None
+        return self.state.users[user_id]
+
+    def admin(self):
+        user = self.current_user()
+        if user and user["role"] != "admin":
+            self.send_json({"detail": "Forbidden"}, 403)
+            return None
+        return user
+
+    def own_task(self, user, task_id):
+        task = self.state.tasks.get(task_id)
+        if task is None or task["user_id"] != user["id"]:
+            self.send_json({"detail": "Task not found"}, 404)
+            return None
+        return task
+
+    def login(self):
+        form = {k: v[0] for k, v in parse_qs(self.body.decode()).items()}
+        user = self.state.find_user(form.get("username"), form.get("password"))
+        if user is None:
+            return self.send_json({"detail": "Invalid credentials"}, 401)
+        self.send_json(self.state.issue_tokens(user["id"]))
+
+    def register(self):
+        data = self.json_body()
+        user = self.state.create_user(data["username"], data["email"], data["password"])
+        if user is None:
+            return self.send_json({"detail": "User already exists"}, 400)
+        self.send_json(self.state.issue_tokens(user["id"]), 201)
+
+    def refresh(self):
+        # Refresh-токен одноразовий, як у бекенді з ротацією токенів
+        auth = self.headers.get("Authorization", "")
+        with self.state.lock:
+            user_id = self.state.refresh_tokens.pop(auth.removeprefix("Bearer "), None)
+        if user_id is None:
+            return self.send_json({"detail": "Invalid refresh token"}, 401)
+        self.send_json(self.state.issue_tokens(user_id))
+
+    def me(self):
+        user = self.current_user()
+        if user:
+            self.send_json({k: v for k, v in user.items() if k != "password"})
+
+    def list_tasks(self):
+        user = self.current_user()
+        if user:
+            self.send_json(self.state.user_tasks(user["id"]))
+
+    def create_task(self):
+        user = self.current_user()
+        if not user:
+            return
+        data = self.json_body()
+        view = self.state.add_task(user["id"], data["title"], data.get("description"))
+        self.send_json(view, 201)
+
+    def update_task(self, task_id):
+        user = self.current_user()
+        task = user and self.own_task(user, task_id)
+        if not task:
+            return
+        data = self.json_body()
+        with self.state.lock:
+            task.update({k: data[k] for k in ("title", "description") if k in data})
+            view = self.state.task_view(task)
+        self.state.publish(user["id"], "task_updated", view)
+        self.send_json(view)
+
+    def delete_task(self, task_id):
+        user = self.current_user()
+        task = user and self.own_task(user, task_id)
+        if not task:
+            return
+        with self.state.lock:
+            del self.state.tasks[task_id]
+            self.state.logs.pop(task_id, None)
+        self.state.publish(user["id"], "task_deleted", {"id": task_id})
+        self.send_json({"id": task_id})
+
+    def task_logs(self, task_id):
+        user = self.current_user()
+        task = user and self.own_task(user, task_id)
+        if not task:
+            return
+        date_from = self.query.get("date_from", "")
+        with self.state.lock:
+            dates = sorted(d for d in self.state.logs.get(task_id, ()) if d >= date_from)
+        self.send_json([{"task_id": task_id, "date": d, "status": True} for d in dates])
+
+    def uncomplete(self, task_id):
+        user = self.current_user()
+        task = user and self.own_task(user, task_id)
+        if not task:
+            return
+        log_date = self.query.get("date", date.today().isoformat())
+        with self.state.lock:
+            self.state.logs.get(task_id, set()).discard(log_date)
+        log = {"task_id": task_id, "date": log_date, "status": False}
+        self.state.publish(user["id"], "log_deleted", log)
+        self.send_json(log)
+
+    def sync(self):
+        user = self.current_user()
+        if not user:
+            return
+        data = self.json_body()
+        # Створені задачі повертаються в тому ж порядку, що й у запиті
+        tasks = [
+            self.state.add_task(user["id"], t["title"], t.get("description"))
+            for t in data.get("created_tasks", [])
+        ]
+        created = []
+        for log in data.get("new_logs", []):
+            with self.state.lock:
+                task = self.state.tasks.get(log["task_id"])
+                if task is None or task["user_id"] != user["id"]:
+                    continue
+                self.state.logs.setdefault(task["id"], set()).add(log["date"])
+            created.append(log)
+            self.state.publish(user["id"], "log_created", log)
+        self.send_json({"created_tasks": tasks, "new_logs": created})
+
+    def list_users(self):
+        if not self.admin():
+            return
+        with self.state.lock:
+            users = [
+                {k: v for k, v in u.items() if k != "password"}
+                for u in self.state.users.values()
+            ]
+        self.send_json(users)
+
+    def users_stats(self):
+        if not self.admin():
+            return
+        ids = [int(i) for i in self.query.get("ids", "").split(",") if i.isdigit()]
+        self.send_json([self.state.activity(i) for i in ids if i in self.state.users])
+
+    def user_stats(self, user_id):
+        if not self.admin():
+            return
+        if user_id not in self.state.users:
+            return self.send_json({"detail": "User not found"}, 404)
+        self.send_json(self.state.activity(user_id))
+
+    def events(self):
+        user = self.current_user()
+        if not user:
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        q = self.state.subscribe(user["id"])
+        try:
+            while True:
+                try:
+                    event_type, data = q.get(timeout=KEEPALIVE_SECONDS)
+                    chunk = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+                except queue.Empty:
+                    chunk = ": keep-alive\n\n"
+                self.wfile.write(chunk.encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.state.unsubscribe(user["id"], q)
+
+
+def make_server(host="127.0.0.1", port=8000, plain=False) -> ThreadingHTTPServer:
+    handler = type("BoundHandler", (Handler,), {"state": State(), "plain": plain})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in HabitTasks API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--plain", action="store_true", help="JSON only, no compression or MessagePack"
+    )
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.plain)
+    print(f"Serving on http://{args.host}:{args.port}{API_PREFIX}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -1,6 +1,7 @@
 from datetime import date, timedelta
 
-from PySide6.QtCore import Qt
+import httpx
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QDialog,
     QFormLayout,
@@ -16,23 +17,25 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from api_client import api
-from components import YearHeatmap
+from cache import HISTORY_DAYS, current_streak, log_date
+from components import StatCard, YearHeatmap
 from constants import (
     COLOR_ACCENT,
     COLOR_BG_CARD,
-    COLOR_TEXT_DIM,
     WINDOW_HEIGHT,
     WINDOW_WIDTH,
 )
+from sessions import api, cache
 
 
 class HabitDetailWindow(QDialog):
-    def __init__(self, task_data, parent=None):
+    taskChanged = Signal(dict)
+    taskDeleted = Signal(int)
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.task_data = task_data
+        self.task_data = None
         self.logs = []
-        self.setWindowTitle(f"Habit Details: {task_data['title']}")
 
         self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
 
@@ -46,12 +49,12 @@ class HabitDetailWindow(QDialog):
         )
         header_layout = QGridLayout(header_group)
 
-        self.title_edit = QLineEdit(task_data["title"])
+        self.title_edit = QLineEdit()
         self.title_edit.setStyleSheet(
             "font-size: 18px; font-weight: bold; border: none; background: transparent; color: white;"
         )
 
-        self.desc_edit = QLineEdit(task_data.get("description") or "")
+        self.desc_edit = QLineEdit()
         self.desc_edit.setPlaceholderText("Description (optional)")
 
         save_btn = QPushButton("Save Changes")
@@ -78,9 +81,9 @@ class HabitDetailWindow(QDialog):
         stats_group = QFrame()
         stats_layout = QHBoxLayout(stats_group)
 
-        self.lbl_streak = self.create_stat_label("Current Streak", "0")
-        self.lbl_total = self.create_stat_label("Total Completions", "0")
-        self.lbl_rate = self.create_stat_label("Win Rate (Year)", "0%")
+        self.lbl_streak = StatCard("Current Streak")
+        self.lbl_total = StatCard("Total Completions")
+        self.lbl_rate = StatCard("Win Rate (Year)", "0%")
 
         stats_layout.addWidget(self.lbl_streak)
         stats_layout.addWidget(self.lbl_total)
@@ -104,58 +107,74 @@ class HabitDetailWindow(QDialog):
         self.map_scroll.setWidget(self.map_container)
         main_layout.addWidget(self.map_scroll)
 
-        self.heatmap = None
+        self.heatmap = YearHeatmap([], interactive=True)
+        self.heatmap.dateClicked.connect(self.toggle_log)
+        self.map_layout.addWidget(self.heatmap)
 
-        self.refresh_data()
+    def load_task(self, task_data):
+        # Вікно створюється один раз, тут лише підміняються дані звички
+        self.task_data = task_data
+        self.setWindowTitle(f"Habit Details: {task_data['title']}")
+        self.title_edit.setText(task_data["title"])
+        self.desc_edit.setText(task_data.get("description") or "")
+        self.title_edit.setModified(False)
+        self.desc_edit.setModified(False)
 
-    def create_stat_label(self, title, value):
-        container = QFrame()
-        container.setStyleSheet(
-            f"background-color: {COLOR_BG_CARD}; border-radius: 8px; padding: 10px;"
-        )
-        l = QVBoxLayout(container)
-        t = QLabel(title)
-        t.setStyleSheet(f"color: {COLOR_TEXT_DIM}; font-size: 12px;")
-        v = QLabel(value)
-        v.setStyleSheet(f"color: {COLOR_ACCENT}; font-size: 20px; font-weight: bold;")
-        v.setAlignment(Qt.AlignCenter)
-        l.addWidget(t)
-        l.addWidget(v)
-        return container
+        self.refresh_data()
 
     def refresh_data(self):
-        year_ago = date.today() - timedelta(days=364)
-        self.logs = api.get_task_logs(self.task_data["id"], date_from=year_ago)
+        # Історію зазвичай уже завантажено для Overview чи сортування, тоді
+        # вікно відкривається без запиту до сервера
+        task_id = self.task_data["id"]
+        if not cache.has_logs(task_id):
+            year_ago = date.today() - timedelta(days=HISTORY_DAYS)
+            try:
+                cache.set_logs(task_id, api.fetch_task_logs(task_id, date_from=year_ago))
+            except httpx.HTTPError:
+                QMessageBox.warning(self, "Error", "Failed to load habit history")
+        self.logs = [
+            {"task_id": task_id, "date": d, "status": True}
+            for d in sorted(cache.logs.get(task_id, ()))
+        ]
 
         self.calculate_stats()
-        self.draw_heatmap()
+        self.heatmap.set_logs(self.logs)
 
     def calculate_stats(self):
-        dates = {l["date"].split("T")[0] for l in self.logs}
+        dates = {log_date(l) for l in self.logs}
         total = len(dates)
+        streak = current_streak(dates)
+        rate = int((total / HISTORY_DAYS) * 100) if total > 0 else 0
+
+        self.lbl_streak.set_value(str(streak))
+        self.lbl_total.set_value(str(total))
+        self.lbl_rate.set_value(f"{rate}%")
+
+    def apply_event(self, event):
+        data = event["data"]
+        if event["type"] == "task_updated":
+            self.task_data.update(data)
+            self.setWindowTitle(f"Habit Details: {self.task_data['title']}")
+            # Не перезаписуємо поля, які користувач саме редагує
+            if not self.title_edit.isModified():
+                self.title_edit.setText(self.task_data["title"])
+            if not self.desc_edit.isModified():
+                self.desc_edit.setText(self.task_data.get("description") or "")
+        elif event["type"] == "task_deleted":
+            self.reject()
+        elif event["type"] in ("log_created", "log_deleted"):
+            status = event["type"] == "log_created" and data.get("status", True)
+            self.set_local_log(data["date"].split("T")[0], status)
+
+    def set_local_log(self, date_str: str, status: bool):
+        self.logs = [l for l in self.logs if l["date"].split("T")[0] != date_str]
+        if status:
+            self.logs.append(
+                {"task_id": self.task_data["id"], "date": date_str, "status": True}
+            )
 
-        streak = 0
-        check = date.today()
-        if check.isoformat() not in dates:
-            check -= timedelta(days=1)
-
-        while check.isoformat() in dates:
-            streak += 1
-            check -= timedelta(days=1)
-
-        rate = int((total / 364) * 100) if total > 0 else 0
-
-        self.lbl_streak.findChild(QLabel, "").nextInFocusChain().setText(str(streak))
-        self.lbl_total.findChild(QLabel, "").nextInFocusChain().setText(str(total))
-        self.lbl_rate.findChild(QLabel, "").nextInFocusChain().setText(f"{rate}%")
-
-    def draw_heatmap(self):
-        if self.heatmap:
-            self.heatmap.deleteLater()
-
-        self.heatmap = YearHeatmap(self.logs, interactive=True)
-        self.heatmap.dateClicked.connect(self.toggle_log)
-        self.map_layout.addWidget(self.heatmap)
+        self.calculate_stats()
+        self.heatmap.set_logs(self.logs)
 
     def toggle_log(self, clicked_date: date):
         date_str = clicked_date.isoformat()
@@ -163,7 +182,11 @@ class HabitDetailWindow(QDialog):
         new_status = date_str not in current_logs
 
         if api.set_log_status(self.task_data["id"], clicked_date, new_status):
-            self.refresh_data()
+            self.set_local_log(date_str, new_status)
+            cache.set_log(self.task_data["id"], date_str, new_status)
+            if clicked_date == date.today():
+                self.task_data["is_completed"] = new_status
+                self.taskChanged.emit(self.task_data)
         else:
             QMessageBox.warning(self, "Error", "Connection error")
 
@@ -173,6 +196,9 @@ class HabitDetailWindow(QDialog):
                 self.title_edit.text(),
                 self.desc_edit.text(),
         ):
+            self.task_data["title"] = self.title_edit.text()
+            self.task_data["description"] = self.desc_edit.text()
+            self.taskChanged.emit(self.task_data)
             QMessageBox.information(self, "Saved", "Task updated.")
             self.accept()
         else:
@@ -184,6 +210,7 @@ class HabitDetailWindow(QDialog):
         )
         if confirm == QMessageBox.Yes:
             if api.delete_task(self.task_data["id"]):
+                self.taskDeleted.emit(self.task_data["id"])
                 self.accept()
 
 
@@ -0,0 +1,67 @@
+import threading
+
+import httpx
+from PySide6.QtCore import QObject, Signal
+
+from api_client import EVENTS_TIMEOUT, APIClient
+from constants import LIVE_RECONNECT_DELAY_MS
+
+
+class LiveUpdates(QObject):
+    eventReceived = Signal(dict)
+    connectionChanged = Signal(bool)
+    resyncNeeded = Signal()
+
+    def __init__(self, api: APIClient, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self._stopped = threading.Event()
+        self._thread = None
+        self._was_connected = False
+        self.connected = False
+
+    def start(self):
+        # Daemon-потік: блокуюче читання потоку подій не заважає закриттю програми,
+        # а сигнали з нього доставляються в GUI-потік через черговані з'єднання.
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            client = httpx.Client(base_url=self.api.base_url, timeout=EVENTS_TIMEOUT)
+            try:
+                for event in self.api.stream_events(client):
+                    if self._stopped.is_set():
+                        break
+                    if event["type"] == "open":
+                        self._on_open()
+                    else:
+                        self.eventReceived.emit(event)
+            except httpx.HTTPStatusError as e:
+                # Сервер без підтримки /events/ - працюємо без live-оновлень
+                if e.response.status_code in (404, 405, 501):
+                    print("Live updates are not supported by the server")
+                    self._stopped.set()
+            except (httpx.HTTPError, ValueError) as e:
+                print(f"Live updates disconnected: {e}")
+            finally:
+                client.close()
+
+            self._set_connected(False)
+            self._stopped.wait(LIVE_RECONNECT_DELAY_MS / 1000)
+
+    def _on_open(self):
+        # Після перепідключення частина подій могла бути втрачена
+        if self._was_connected:
+            self.resyncNeeded.emit()
+        self._was_connected = True
+        self._set_connected(True)
+
+    def _set_connected(self, connected: bool):
+        if connected != self.connected:
+            self.connected = connected
+            self.connectionChanged.emit(connected)
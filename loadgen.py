@@ -0,0 +1,228 @@
+"""Генератор навантаження: віртуальні користувачі, що працюють з API так само, як клієнт.
+
+Кожен процес запускає свою частку віртуальних користувачів у потоках,
+кожен користувач має власний APIClient (реєстрація, логін, оновлення токена,
+get_tasks, get_task_logs, /sync/) і робить паузи між діями.
+
+    python loadgen.py --users 2000 --processes 8 --duration 60
+    python loadgen.py --local --users 200 --duration 20
+"""
+
+import argparse
+import os
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List
+
+import httpx
+
+from api_client import DEFAULT_BASE_URL, APIClient
+from cache import HISTORY_DAYS
+
+TASKS_PER_USER = 5
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def on_request(self, request):
+        request.extensions["loadgen_start"] = time.perf_counter()
+
+    def on_response(self, response):
+        # Тіло читається тут, щоб затримка включала передачу відповіді
+        try:
+            response.read()
+        except httpx.TransportError:
+            self.record(response.request, failed=True)
+            raise
+        self.record(response.request, failed=response.status_code >= 400)
+
+    def record(self, request, failed: bool):
+        elapsed = time.perf_counter() - request.extensions["loadgen_start"]
+        endpoint = f"{request.method} {ID_SEGMENT.sub('/{id}', request.url.path)}"
+        with self.lock:
+            self.latencies[endpoint].append(elapsed * 1000)
+            if failed:
+                self.errors[endpoint] += 1
+
+    def on_failure(self, endpoint: str):
+        with self.lock:
+            self.errors[endpoint] += 1
+
+
+class RecordingTransport(httpx.HTTPTransport):
+    # Таймаути, відмови та розриви з'єднання не доходять до response-хука,
+    # тож такі запити враховуються тут - інакше під перевантаженням вони
+    # зникали б і з помилок, і з перцентилів
+    def __init__(self, recorder: Recorder, **kwargs):
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    def handle_request(self, request):
+        try:
+            return super().handle_request(request)
+        except httpx.TransportError:
+            self.recorder.record(request, failed=True)
+            raise
+
+
+def user_iteration(api, rng, recorder):
+    # Методи APIClient, що повертають []/False при помилці, тут не годяться:
+    # невдалий запит тихо пропускав би решту ітерації
+    tasks = api.fetch_tasks()
+    if not tasks:
+        # Користувач щойно створив задачі, порожній список - це помилка сервера
+        recorder.on_failure("GET /tasks/")
+        return
+
+    year_ago = date.today() - timedelta(days=HISTORY_DAYS)
+    api.fetch_task_logs(rng.choice(tasks)["id"], date_from=year_ago)
+
+    done = rng.sample(tasks, k=rng.randint(1, len(tasks)))
+    log_day = (date.today() - timedelta(days=rng.randrange(30))).isoformat()
+    api.sync(new_logs=[{"task_id": t["id"], "date": log_day, "status": True} for t in done])
+
+
+def virtual_user(base_url, index, deadline, think_time, recorder, verify):
+    rng = random.Random(f"{os.getpid()}-{index}")
+    api = APIClient(
+        base_url,
+        transport=RecordingTransport(recorder, verify=verify),
+        event_hooks={"request": [recorder.on_request], "response": [recorder.on_response]},
+    )
+    username = f"load_{os.getpid()}_{index}_{rng.randrange(10**9)}"
+    password = "load-test-password"
+
+    try:
+        if not api.register(username, f"{username}@example.com", password):
+            recorder.on_failure("register")
+            return
+        if not api.login(username, password):
+            recorder.on_failure("login")
+            return
+        for i in range(TASKS_PER_USER):
+            api.create_task(f"Habit {i}", "load test")
+
+        while time.monotonic() < deadline:
+            try:
+                user_iteration(api, rng, recorder)
+            except httpx.HTTPError:
+                # Запит уже враховано транспортом або хуком, користувач продовжує
+                pass
+            except ValueError:
+                recorder.on_failure("invalid response")
+
+            time.sleep(min(rng.expovariate(1 / think_time), max(deadline - time.monotonic(), 0)))
+    except Exception:
+        recorder.on_failure("virtual user")
+    finally:
+        api.close()
+
+
+def run_worker(base_url, users, first_index, duration, ramp_up, think_time):
+    # Вивід APIClient про помилки під навантаженням лише заважає звіту
+    sys.stdout = sys.stderr = open(os.devnull, "w")
+    recorder = Recorder()
+    verify = ssl.create_default_context()
+    deadline = time.monotonic() + ramp_up + duration
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        for i in range(users):
+            pool.submit(
+                virtual_user, base_url, first_index + i, deadline, think_time, recorder, verify
+            )
+            time.sleep(ramp_up / users)
+
+    return dict(recorder.latencies), dict(recorder.errors)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(p / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run(base_url, users, processes, duration, ramp_up, think_time):
+    shares = [users // processes + (1 if i < users % processes else 0) for i in range(processes)]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(
+                run_worker,
+                base_url,
+                share,
+                sum(shares[:i]),
+                duration,
+                ramp_up,
+                think_time,
+            )
+            for i, share in enumerate(shares)
+            if share
+        ]
+        for future in futures:
+            worker_latencies, worker_errors = future.result()
+            for endpoint, values in worker_latencies.items():
+                latencies[endpoint].extend(values)
+            for endpoint, count in worker_errors.items():
+                errors[endpoint] += count
+    elapsed = time.monotonic() - started
+
+    print(f"{users} virtual users, {processes} processes, {elapsed:.1f}s wall time")
+    print(f"{'endpoint':<32}{'count':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for endpoint in sorted(set(latencies) | set(errors)):
+        values = sorted(latencies.get(endpoint, []))
+        print(
+            f"{endpoint:<32}{len(values):>8}{errors.get(endpoint, 0):>8}"
+            f"{len(values) / elapsed:>9.1f}{percentile(values, 50):>9.1f}"
+            f"{percentile(values, 95):>9.1f}{percentile(values, 99):>9.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HabitTasks API load generator")
+    parser.add_argument("--server", default=DEFAULT_BASE_URL)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds at full load")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds to start all users")
+    parser.add_argument("--think-time", type=float, default=2.0, help="mean pause in seconds")
+    parser.add_argument(
+        "--local", action="store_true", help="run against an in-process dev_server"
+    )
+    args = parser.parse_args(argv)
+
+    base_url = args.server
+    if args.local:
+        import dev_server
+
+        server = dev_server.make_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}{dev_server.API_PREFIX}"
+
+    run(
+        base_url,
+        args.users,
+        min(args.processes, max(args.users, 1)),
+        args.duration,
+        args.ramp_up,
+        args.think_time,
+    )
+
+
+if __name__ == "__main__":
+    main()
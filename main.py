@@ -5,6 +5,7 @@ from qt_material import apply_stylesheet
 
 from auth import AuthWindow
 from main_window import MainWindow
+from sessions import manager
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -21,6 +22,7 @@ if __name__ == "__main__":
 
     auth = AuthWindow()
     if auth.exec():
+        manager.add(auth.session)
         w = MainWindow()
         w.show()
         sys.exit(app.exec())
\ No newline at end of file
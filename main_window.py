@@ -1,8 +1,11 @@
-from PySide6.QtWidgets import QMainWindow, QTabWidget
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QComboBox, QMainWindow, QTabWidget
 
-from api_client import api
+from auth import AuthWindow
 from constants import WINDOW_HEIGHT, WINDOW_WIDTH
-from tabs import AdminTab, HabitsTab, ProfileTab
+from live_updates import LiveUpdates
+from sessions import api, manager
+from tabs import AdminTab, HabitsTab, OverviewTab, ProfileTab
 
 
 class MainWindow(QMainWindow):
@@ -16,22 +19,117 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.tabs)
 
         self.tab_habits = HabitsTab()
+        self.tab_overview = OverviewTab()
         self.tab_profile = ProfileTab()
+        self.tab_admin = None
 
         self.tabs.addTab(self.tab_habits, "Habits")
+        self.tabs.addTab(self.tab_overview, "Overview")
         self.tabs.addTab(self.tab_profile, "Profile")
 
-        if api.user_role == "admin":
-            self.tab_admin = AdminTab()
-            self.tabs.addTab(self.tab_admin, "Admin Panel")
+        self.account_box = QComboBox()
+        self.account_box.activated.connect(self.on_account_selected)
+        self.tabs.setCornerWidget(self.account_box, Qt.TopRightCorner)
 
         self.tabs.currentChanged.connect(self.on_tab_change)
+        self.tab_profile.dataImported.connect(self.tab_habits.reload_all)
+        self.tab_profile.logoutRequested.connect(self.logout)
 
-        self.tab_habits.load_tasks()
+        # Кожна сесія має власний live-канал, тож кеш неактивних акаунтів
+        # теж залишається актуальним і перемикання не потребує перезавантаження
+        self.live_updates = {}
+        self.switch_session(manager.active)
+
+    def closeEvent(self, event):
+        for live in self.live_updates.values():
+            live.stop()
+        if self.tab_admin is not None:
+            self.tab_admin.stop_loading()
+        super().closeEvent(event)
 
     def on_tab_change(self, index):
         widget = self.tabs.widget(index)
-        if isinstance(widget, ProfileTab):
+        if isinstance(widget, (OverviewTab, ProfileTab)):
             widget.refresh()
         elif isinstance(widget, AdminTab):
-            widget.load_users()
\ No newline at end of file
+            widget.load_users()
+
+    def update_account_box(self):
+        self.account_box.clear()
+        for session in manager.sessions:
+            self.account_box.addItem(session.label, session)
+        self.account_box.addItem("+ Add account", None)
+        self.account_box.setCurrentIndex(manager.sessions.index(manager.active))
+
+    def on_account_selected(self, index):
+        session = self.account_box.itemData(index)
+        if session is None:
+            auth = AuthWindow(self)
+            if not auth.exec():
+                self.update_account_box()
+                return
+            session = manager.add(auth.session)
+        self.switch_session(session)
+
+    def switch_session(self, session):
+        manager.activate(session)
+        self.update_account_box()
+
+        for old in [s for s in self.live_updates if s not in manager.sessions]:
+            self.live_updates.pop(old).stop()
+        if session not in self.live_updates:
+            live = LiveUpdates(session.api, self)
+            live.eventReceived.connect(self.on_live_event)
+            live.connectionChanged.connect(self.on_live_status)
+            live.resyncNeeded.connect(self.on_resync)
+            self.live_updates[session] = live
+            live.start()
+
+        if api.user_role == "admin" and self.tab_admin is None:
+            self.tab_admin = AdminTab()
+            self.tabs.addTab(self.tab_admin, "Admin Panel")
+        elif api.user_role != "admin" and self.tab_admin is not None:
+            self.tab_admin.stop_loading()
+            self.tabs.removeTab(self.tabs.indexOf(self.tab_admin))
+            self.tab_admin.deleteLater()
+            self.tab_admin = None
+
+        self.tab_habits.show_cached()
+        self.tab_habits.set_live_status(self.live_updates[session].connected)
+        self.on_tab_change(self.tabs.currentIndex())
+
+    def session_of(self, live):
+        for session, session_live in self.live_updates.items():
+            if session_live is live:
+                return session
+        return None
+
+    def on_live_event(self, event):
+        session = self.session_of(self.sender())
+        if session is manager.active:
+            self.tab_habits.apply_event(event)
+            self.tab_overview.on_event(event)
+        elif session is not None:
+            session.cache.apply_event(event)
+
+    def on_live_status(self, connected):
+        if self.session_of(self.sender()) is manager.active:
+            self.tab_habits.set_live_status(connected)
+
+    def on_resync(self):
+        session = self.session_of(self.sender())
+        if session is None:
+            return
+        session.cache.invalidate()
+        if session is manager.active:
+            self.tab_habits.load_tasks()
+
+    def logout(self):
+        session = manager.active
+        live = self.live_updates.pop(session, None)
+        if live is not None:
+            live.stop()
+        if manager.remove(session) is None:
+            QApplication.quit()
+            return
+        self.switch_session(manager.active)
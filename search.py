@@ -0,0 +1,52 @@
+import re
+from typing import Any, Dict, Optional, Set
+
+WORD = re.compile(r"\w+")
+MAX_PREFIX_LENGTH = 20
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    return set(WORD.findall((text or "").lower()))
+
+
+class TaskIndex:
+    # Префіксний інвертований індекс: кожен префікс слова з назви та опису
+    # вказує на множину задач, тож пошук - це перетин кількох множин
+    def __init__(self):
+        self.prefixes: Dict[str, Set[int]] = {}
+        self.task_prefixes: Dict[int, Set[str]] = {}
+
+    def clear(self):
+        self.prefixes.clear()
+        self.task_prefixes.clear()
+
+    def add(self, task: Dict[str, Any]):
+        self.remove(task["id"])
+        words = tokenize(task.get("title")) | tokenize(task.get("description"))
+        prefixes = {
+            word[:i] for word in words for i in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1)
+        }
+        self.task_prefixes[task["id"]] = prefixes
+        for prefix in prefixes:
+            self.prefixes.setdefault(prefix, set()).add(task["id"])
+
+    def remove(self, task_id: int):
+        for prefix in self.task_prefixes.pop(task_id, ()):
+            ids = self.prefixes[prefix]
+            ids.discard(task_id)
+            if not ids:
+                del self.prefixes[prefix]
+
+    def search(self, query: str) -> Optional[Set[int]]:
+        # None означає порожній запит, тобто підходять усі задачі
+        words = tokenize(query)
+        if not words:
+            return None
+
+        result = None
+        for word in sorted(words, key=len, reverse=True):
+            ids = self.prefixes.get(word[:MAX_PREFIX_LENGTH], set())
+            result = ids.copy() if result is None else result & ids
+            if not result:
+                break
+        return result
@@ -0,0 +1,72 @@
+from typing import Any, Callable, List, Optional
+
+from api_client import DEFAULT_BASE_URL, APIClient
+from cache import HabitCache
+
+
+class Session:
+    # Окремий обліковий запис: власний APIClient (пул з'єднань і токени) та кеш
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, username: Optional[str] = None):
+        self.api = APIClient(base_url)
+        self.cache = HabitCache()
+        self.username = username
+
+    @property
+    def key(self) -> str:
+        return f"{self.username}@{self.api.base_url}"
+
+    @property
+    def label(self) -> str:
+        if self.api.base_url == DEFAULT_BASE_URL:
+            return self.username or "-"
+        return self.key
+
+    def close(self):
+        self.api.close()
+
+
+class SessionManager:
+    def __init__(self):
+        self.sessions: List[Session] = [Session()]
+        self.active: Session = self.sessions[0]
+
+    def add(self, session: Session) -> Session:
+        # Повторний вхід у той самий акаунт замінює стару сесію
+        for i, existing in enumerate(self.sessions):
+            if existing.key == session.key or existing.username is None:
+                if existing is not session:
+                    existing.close()
+                self.sessions[i] = session
+                break
+        else:
+            self.sessions.append(session)
+        self.active = session
+        return session
+
+    def activate(self, session: Session):
+        self.active = session
+
+    def remove(self, session: Session) -> Optional[Session]:
+        self.sessions.remove(session)
+        session.close()
+        if self.active is session:
+            self.active = self.sessions[0] if self.sessions else None
+        return self.active
+
+
+class _ActiveProxy:
+    # Модулі GUI імпортують api/cache один раз, а проксі завжди звертається
+    # до об'єкта активної сесії, тож перемикання акаунта не потребує реімпорту
+    def __init__(self, getter: Callable[[], Any]):
+        object.__setattr__(self, "_getter", getter)
+
+    def __getattr__(self, name):
+        return getattr(self._getter(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._getter(), name, value)
+
+
+manager = SessionManager()
+api = _ActiveProxy(lambda: manager.active.api)
+cache = _ActiveProxy(lambda: manager.active.cache)
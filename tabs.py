@@ -1,11 +1,17 @@
-from PySide6.QtCore import Qt
+from datetime import date, timedelta
+
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtWidgets import (
-    QApplication,
+    QComboBox,
+    QFileDialog,
     QFormLayout,
     QFrame,
     QHBoxLayout,
     QHeaderView,
     QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressDialog,
     QPushButton,
     QScrollArea,
     QTableWidget,
@@ -14,10 +20,38 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from api_client import api
-from components import HabitCard
-from constants import COLOR_ACCENT, COLOR_BG_CARD
+from cache import HISTORY_DAYS
+from components import HabitCard, StatCard, YearHeatmap
+from constants import (
+    COLOR_ACCENT,
+    COLOR_BG_CARD,
+    COLOR_TEXT_DIM,
+    EXPORT_FILTER,
+    EXPORT_FILTERS,
+    VIEW_UPDATE_DELAY_MS,
+)
 from dialogs import CreateHabitDialog, HabitDetailWindow
+from search import TaskIndex
+from sessions import api, cache, manager
+from transfer import (
+    CSV_SUFFIX,
+    PACKED_SUFFIX,
+    export_data,
+    file_format,
+    import_data,
+)
+from transfer_worker import TransferWorker
+from user_stats import UserStatsLoader
+
+
+def load_missing_logs():
+    # Історію підвантажуємо лише для задач, яких ще немає в кеші,
+    # решта оновлюється інкрементально подіями та локальними змінами
+    missing = cache.missing_logs()
+    if missing:
+        year_ago = date.today() - timedelta(days=HISTORY_DAYS)
+        for task_id, logs in api.get_logs_for_tasks(missing, year_ago).items():
+            cache.set_logs(task_id, logs)
 
 
 class HabitsTab(QWidget):
@@ -35,12 +69,69 @@ class HabitsTab(QWidget):
         )
         add_btn.clicked.connect(self.add_task)
 
+        self.select_btn = QPushButton("Select")
+        self.select_btn.setCheckable(True)
+        self.select_btn.toggled.connect(self.set_selection_mode)
+
+        self.lbl_live = QLabel()
+        self.set_live_status(False)
+
         top_bar.addWidget(QLabel("My Habits"))
         top_bar.addStretch()
+        top_bar.addWidget(self.lbl_live)
+        top_bar.addWidget(self.select_btn)
         top_bar.addWidget(refresh_btn)
         top_bar.addWidget(add_btn)
         layout.addLayout(top_bar)
 
+        self.bulk_bar = QWidget()
+        bulk_layout = QHBoxLayout(self.bulk_bar)
+        bulk_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.lbl_selected = QLabel()
+        select_all_btn = QPushButton("Select All")
+        select_all_btn.clicked.connect(self.select_all)
+
+        self.bulk_complete_btn = QPushButton("✔ Complete Today")
+        self.bulk_complete_btn.setStyleSheet(f"background-color: {COLOR_ACCENT};")
+        self.bulk_complete_btn.clicked.connect(self.complete_selected)
+
+        self.bulk_delete_btn = QPushButton("Delete")
+        self.bulk_delete_btn.setStyleSheet("background-color: #d32f2f; color: white;")
+        self.bulk_delete_btn.clicked.connect(self.delete_selected)
+
+        bulk_layout.addWidget(self.lbl_selected)
+        bulk_layout.addStretch()
+        bulk_layout.addWidget(select_all_btn)
+        bulk_layout.addWidget(self.bulk_complete_btn)
+        bulk_layout.addWidget(self.bulk_delete_btn)
+        self.bulk_bar.setVisible(False)
+        layout.addWidget(self.bulk_bar)
+
+        view_bar = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search habits...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.apply_view)
+
+        self.filter_box = QComboBox()
+        self.filter_box.addItem("All", None)
+        self.filter_box.addItem("Done today", True)
+        self.filter_box.addItem("Not done today", False)
+        self.filter_box.currentIndexChanged.connect(self.apply_view)
+
+        self.sort_box = QComboBox()
+        self.sort_box.addItem("Default order", None)
+        self.sort_box.addItem("Title", "title")
+        self.sort_box.addItem("Current streak", "streak")
+        self.sort_box.addItem("Completion rate", "rate")
+        self.sort_box.currentIndexChanged.connect(self.on_sort_change)
+
+        view_bar.addWidget(self.search_edit)
+        view_bar.addWidget(self.filter_box)
+        view_bar.addWidget(self.sort_box)
+        layout.addLayout(view_bar)
+
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
         self.scroll.setStyleSheet("background: transparent; border: none;")
@@ -53,30 +144,314 @@ class HabitsTab(QWidget):
         self.scroll.setWidget(self.container)
         layout.addWidget(self.scroll)
 
+        self.cards = {}
+        self.order = []
+        self.index = TaskIndex()
+        self.detail_window = None
+        self.live = False
+
+        # Пачка подій (наприклад, під час імпорту) дає одне перевпорядкування
+        # списку за VIEW_UPDATE_DELAY_MS, а не по одному на кожну подію
+        self.view_timer = QTimer(self)
+        self.view_timer.setSingleShot(True)
+        self.view_timer.setInterval(VIEW_UPDATE_DELAY_MS)
+        self.view_timer.timeout.connect(self.apply_view)
+
     def load_tasks(self):
+        # Без live-каналу кеш логів не дізнається про зміни з інших пристроїв,
+        # тож історія завантажується заново
+        if not self.live:
+            cache.invalidate()
+        tasks = api.get_tasks()
+        cache.set_tasks(tasks)
+        self.show_tasks(tasks)
+
+    def reload_all(self):
+        # Імпортовані логи могли не прийти подіями навіть з live-каналом
+        cache.invalidate()
+        self.load_tasks()
+
+    def show_cached(self):
+        # Після перемикання акаунта показуємо кеш сесії без звернення до сервера
+        if cache.tasks_loaded:
+            self.show_tasks(list(cache.tasks.values()))
+        else:
+            self.load_tasks()
+
+    def show_tasks(self, tasks):
         while self.tasks_layout.count():
             w = self.tasks_layout.takeAt(0).widget()
             if w:
                 w.deleteLater()
+        self.cards.clear()
+        self.order.clear()
+        self.index.clear()
 
-        tasks = api.get_tasks()
+        # Картки додаються у прихований контейнер, щоб layout перерахувався один раз
+        self.container.hide()
         for t in tasks:
-            card = HabitCard(t)
-            card.cardClicked.connect(self.open_details)
-            self.tasks_layout.addWidget(card)
+            self.add_card(t)
+        if self.sort_box.currentData() in ("streak", "rate"):
+            load_missing_logs()
+        self.apply_view()
+        self.container.show()
+        self.update_selection()
+
+    def add_card(self, task_data):
+        card = HabitCard(task_data)
+        card.cardClicked.connect(self.open_details)
+        card.selectionChanged.connect(self.update_selection)
+        card.needsRefresh.connect(self.apply_view)
+        card.set_selectable(self.select_btn.isChecked())
+        self.tasks_layout.addWidget(card)
+        self.cards[task_data["id"]] = card
+        self.order.append(task_data["id"])
+        self.index.add(task_data)
+
+    def on_sort_change(self):
+        if self.sort_box.currentData() in ("streak", "rate"):
+            load_missing_logs()
+        self.apply_view()
+
+    def sorted_ids(self):
+        ids = list(self.cards)
+        sort = self.sort_box.currentData()
+        if sort == "title":
+            ids.sort(key=lambda task_id: self.cards[task_id].task_data["title"].lower())
+        elif sort == "streak":
+            ids.sort(key=cache.task_streak, reverse=True)
+        elif sort == "rate":
+            ids.sort(key=cache.task_rate, reverse=True)
+        return ids
+
+    def apply_view(self):
+        # Картки не перестворюються: змінюється лише порядок у layout та видимість
+        order = self.sorted_ids()
+        if order != self.order:
+            # Виймаємо елементи з кінця, щоб не зсувати решту списку на кожному кроці
+            for i in reversed(range(self.tasks_layout.count())):
+                self.tasks_layout.takeAt(i)
+            for task_id in order:
+                self.tasks_layout.addWidget(self.cards[task_id])
+            self.order = order
+
+        matches = self.index.search(self.search_edit.text())
+        status = self.filter_box.currentData()
+        changes = []
+        for task_id, card in self.cards.items():
+            visible = (matches is None or task_id in matches) and (
+                status is None or card.task_data["is_completed"] == status
+            )
+            if card.isHidden() == visible:
+                changes.append((card, visible))
+
+        # Показ картки у видимому контейнері щоразу перераховує весь layout,
+        # тому на час пакетної зміни контейнер ховаємо
+        batch = len(changes) > 1 and self.container.isVisible()
+        if batch:
+            self.container.hide()
+        for card, visible in changes:
+            card.setVisible(visible)
+        if batch:
+            self.container.show()
+
+    def set_selection_mode(self, enabled: bool):
+        self.bulk_bar.setVisible(enabled)
+        for card in self.cards.values():
+            card.set_selectable(enabled)
+        self.update_selection()
+
+    def selected_ids(self):
+        return [task_id for task_id, card in self.cards.items() if card.is_selected()]
+
+    def select_all(self):
+        visible = [card for card in self.cards.values() if not card.isHidden()]
+        select = not all(card.is_selected() for card in visible)
+        for card in visible:
+            card.chk_select.setChecked(select)
+
+    def update_selection(self):
+        count = len(self.selected_ids())
+        self.lbl_selected.setText(f"Selected: {count}")
+        self.bulk_complete_btn.setEnabled(count > 0)
+        self.bulk_delete_btn.setEnabled(count > 0)
+
+    def complete_selected(self):
+        today = date.today()
+        task_ids = [
+            task_id
+            for task_id in self.selected_ids()
+            if not self.cards[task_id].task_data["is_completed"]
+        ]
+        if task_ids and not api.complete_tasks(task_ids, today):
+            QMessageBox.warning(self, "Error", "Connection error")
+            return
+
+        for task_id in task_ids:
+            cache.set_log(task_id, today.isoformat(), True)
+            self.cards[task_id].set_completed(True)
+        self.select_btn.setChecked(False)
+        self.apply_view()
+
+    def delete_selected(self):
+        task_ids = self.selected_ids()
+        confirm = QMessageBox.question(
+            self, "Confirm", f"Delete {len(task_ids)} selected habits?"
+        )
+        if confirm != QMessageBox.Yes:
+            return
+
+        deleted = api.delete_tasks(task_ids)
+        for task_id in deleted:
+            self.remove_card(task_id)
+        if len(deleted) < len(task_ids):
+            QMessageBox.warning(
+                self, "Error", f"Failed to delete {len(task_ids) - len(deleted)} habits"
+            )
+        self.update_selection()
+
+    def remove_card(self, task_id):
+        cache.remove_task(task_id)
+        self.index.remove(task_id)
+        card = self.cards.pop(task_id, None)
+        if card:
+            self.order.remove(task_id)
+            self.tasks_layout.removeWidget(card)
+            card.deleteLater()
+            if card.is_selected():
+                self.update_selection()
+
+    def set_live_status(self, connected: bool):
+        self.live = connected
+        self.lbl_live.setText("● Live" if connected else "")
+        self.lbl_live.setStyleSheet(f"color: {COLOR_ACCENT};")
+
+    def apply_event(self, event):
+        cache.apply_event(event)
+        data = event["data"]
+        event_type = event["type"]
+
+        if event_type == "task_created":
+            if data["id"] not in self.cards:
+                self.add_card(data)
+        elif event_type == "task_updated":
+            self.update_card(data)
+        elif event_type == "task_deleted":
+            self.remove_card(data["id"])
+        elif event_type in ("log_created", "log_deleted"):
+            card = self.cards.get(data["task_id"])
+            if card and data["date"].split("T")[0] == date.today().isoformat():
+                completed = event_type == "log_created" and data.get("status", True)
+                card.set_completed(completed)
+        else:
+            return
+        if not self.view_timer.isActive():
+            self.view_timer.start()
+
+        task_id = data.get("task_id", data.get("id"))
+        dlg = self.detail_window
+        if dlg is not None and dlg.isVisible() and dlg.task_data["id"] == task_id:
+            dlg.apply_event(event)
+
+    def update_card(self, task_data):
+        cache.upsert_task(task_data)
+        card = self.cards.get(task_data["id"])
+        if card:
+            card.update_data(task_data)
+            self.index.add(card.task_data)
+            self.apply_view()
 
     def open_details(self, task_data):
-        dlg = HabitDetailWindow(task_data, self)
-        if dlg.exec():
-            self.load_tasks()
+        if self.detail_window is None:
+            self.detail_window = HabitDetailWindow(self)
+            self.detail_window.taskChanged.connect(self.update_card)
+            self.detail_window.taskDeleted.connect(self.remove_card)
+
+        self.detail_window.load_task(task_data)
+        self.detail_window.exec()
 
     def add_task(self):
         dlg = CreateHabitDialog(self)
-        if dlg.exec():
+        if dlg.exec() and not self.live:
             self.load_tasks()
 
 
+class OverviewTab(QWidget):
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setSpacing(20)
+
+        stats_layout = QHBoxLayout()
+        self.lbl_habits = StatCard("Habits")
+        self.lbl_today = StatCard("Done Today")
+        self.lbl_week = StatCard("Last 7 Days")
+        self.lbl_month = StatCard("Last 30 Days")
+        for card in (self.lbl_habits, self.lbl_today, self.lbl_week, self.lbl_month):
+            stats_layout.addWidget(card)
+        layout.addLayout(stats_layout)
+
+        layout.addWidget(QLabel("Combined Progress (all habits):"))
+
+        map_scroll = QScrollArea()
+        map_scroll.setFixedHeight(180)
+        map_scroll.setWidgetResizable(True)
+        map_scroll.setStyleSheet("background: transparent; border: none;")
+
+        map_container = QWidget()
+        map_layout = QHBoxLayout(map_container)
+        map_layout.setAlignment(Qt.AlignCenter)
+        self.heatmap = YearHeatmap([])
+        map_layout.addWidget(self.heatmap)
+
+        map_scroll.setWidget(map_container)
+        layout.addWidget(map_scroll)
+
+        layout.addWidget(QLabel("Top Streaks:"))
+        self.streaks_layout = QVBoxLayout()
+        layout.addLayout(self.streaks_layout)
+        layout.addStretch()
+
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(VIEW_UPDATE_DELAY_MS)
+        self.render_timer.timeout.connect(self.render)
+
+    def refresh(self):
+        load_missing_logs()
+        self.render()
+
+    def render(self):
+        self.lbl_habits.set_value(str(len(cache.tasks)))
+        self.lbl_today.set_value(f"{int(cache.completion_rate(1) * 100)}%")
+        self.lbl_week.set_value(f"{int(cache.completion_rate(7) * 100)}%")
+        self.lbl_month.set_value(f"{int(cache.completion_rate(30) * 100)}%")
+
+        self.heatmap.set_levels(cache.daily_levels())
+
+        while self.streaks_layout.count():
+            w = self.streaks_layout.takeAt(0).widget()
+            if w:
+                w.deleteLater()
+
+        top = cache.top_streaks()
+        if not top:
+            self.streaks_layout.addWidget(QLabel("No active streaks yet"))
+        for task, streak in top:
+            days = "day" if streak == 1 else "days"
+            lbl = QLabel(f"{task['title']} — {streak} {days}")
+            lbl.setStyleSheet("font-size: 14px;")
+            self.streaks_layout.addWidget(lbl)
+
+    def on_event(self, event):
+        if self.isVisible() and not self.render_timer.isActive():
+            self.render_timer.start()
+
+
 class ProfileTab(QWidget):
+    dataImported = Signal()
+    logoutRequested = Signal()
+
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout(self)
@@ -99,6 +474,19 @@ class ProfileTab(QWidget):
 
         self.layout.addWidget(self.info_frame)
 
+        data_layout = QHBoxLayout()
+        export_btn = QPushButton("Export Data")
+        export_btn.clicked.connect(self.do_export)
+        import_btn = QPushButton("Import Data")
+        import_btn.clicked.connect(self.do_import)
+        data_layout.addWidget(export_btn)
+        data_layout.addWidget(import_btn)
+
+        data_frame = QWidget()
+        data_frame.setFixedWidth(500)
+        data_frame.setLayout(data_layout)
+        self.layout.addWidget(data_frame)
+
         logout_btn = QPushButton("Logout")
         logout_btn.setFixedWidth(500)
         logout_btn.setStyleSheet("background-color: #d32f2f; margin-top: 20px;")
@@ -112,29 +500,180 @@ class ProfileTab(QWidget):
             self.lbl_email.setText(data.get("email", "-"))
             self.lbl_role.setText(data.get("role", "user").upper())
 
+    def do_export(self):
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Export Data", "habits.csv", EXPORT_FILTER
+        )
+        if not path:
+            return
+        # Явне розширення файлу важливіше за обраний фільтр
+        fmt = file_format(path, None)
+        if fmt is None:
+            fmt = EXPORT_FILTERS.get(selected, CSV_SUFFIX)
+            path += fmt
+        worker = self.start_transfer("Exporting habits...", export_data, path, fmt)
+        worker.finished.connect(self.on_exported)
+        worker.failed.connect(self.on_export_failed)
+        worker.start()
+
+    def do_import(self):
+        path, selected = QFileDialog.getOpenFileName(self, "Import Data", "", EXPORT_FILTER)
+        if not path:
+            return
+        fmt = file_format(path, EXPORT_FILTERS.get(selected, PACKED_SUFFIX))
+        worker = self.start_transfer("Importing habits...", import_data, path, fmt)
+        worker.finished.connect(self.on_imported)
+        worker.failed.connect(self.on_import_failed)
+        worker.start()
+
+    def start_transfer(self, title, fn, *args):
+        self.progress = QProgressDialog(title, "Cancel", 0, 0, self)
+        self.progress.setWindowModality(Qt.WindowModal)
+        self.progress.setAutoReset(False)
+        self.progress.setMinimumDuration(0)
+        # Конкретний api сесії, а не проксі: передача прив'язана до акаунта
+        self.worker = TransferWorker(fn, manager.active.api, *args)
+        self.worker.progressChanged.connect(self.on_transfer_progress)
+        self.progress.canceled.connect(self.worker.stop)
+        return self.worker
+
+    def end_transfer(self):
+        self.worker = None
+        self.progress.close()
+
+    def on_transfer_progress(self, done, total):
+        if self.sender() is self.worker:
+            self.progress.setMaximum(total)
+            self.progress.setValue(done)
+
+    def on_exported(self, count):
+        self.end_transfer()
+        QMessageBox.information(self, "Exported", f"Exported {count} habits.")
+
+    def on_export_failed(self, error):
+        self.end_transfer()
+        QMessageBox.warning(self, "Error", f"Export failed: {error}")
+
+    def on_imported(self, result):
+        self.end_transfer()
+        tasks_count, logs_count = result
+        QMessageBox.information(
+            self, "Imported", f"Imported {tasks_count} habits and {logs_count} logs."
+        )
+        self.dataImported.emit()
+
+    def on_import_failed(self, error):
+        self.end_transfer()
+        QMessageBox.warning(self, "Error", f"Import failed: {error}")
+        # Частина даних могла вже потрапити на сервер
+        self.dataImported.emit()
+
     def logout(self):
-        QApplication.quit()
+        self.logoutRequested.emit()
 
 
 class AdminTab(QWidget):
+    STATS_COLUMN = 3
+
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout(self)
 
+        top_bar = QHBoxLayout()
         btn_refresh = QPushButton("Refresh Users")
-        btn_refresh.clicked.connect(self.load_users)
-        layout.addWidget(btn_refresh)
+        btn_refresh.clicked.connect(self.refresh_all)
+        top_bar.addWidget(btn_refresh)
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet(f"color: {COLOR_TEXT_DIM};")
+        top_bar.addWidget(self.lbl_status)
+        top_bar.addStretch()
+        layout.addLayout(top_bar)
 
         self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["ID", "Username", "Role"])
+        self.table.setColumnCount(7)
+        self.table.setHorizontalHeaderLabels(
+            ["ID", "Username", "Role", "Habits", "Done 7d", "Done 30d", "Last active"]
+        )
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.table)
 
+        self.rows = {}
+        self.loader = None
+        self.loaded = 0
+
+    def refresh_all(self):
+        # Явне оновлення ігнорує TTL, перемикання вкладок - ні
+        cache.user_stats.clear()
+        self.load_users()
+
     def load_users(self):
+        self.stop_loading()
+        session = manager.active
         users = api.get_all_users()
+
+        self.rows = {}
+        missing = []
+        self.table.setUpdatesEnabled(False)
         self.table.setRowCount(len(users))
         for i, u in enumerate(users):
+            self.rows[u["id"]] = i
             self.table.setItem(i, 0, QTableWidgetItem(str(u["id"])))
             self.table.setItem(i, 1, QTableWidgetItem(u["username"]))
-            self.table.setItem(i, 2, QTableWidgetItem(u["role"]))
\ No newline at end of file
+            self.table.setItem(i, 2, QTableWidgetItem(u["role"]))
+            stats = session.cache.user_stats.get(u["id"])
+            if stats is None:
+                missing.append(u["id"])
+            self.set_stats(i, stats)
+        self.table.setUpdatesEnabled(True)
+
+        self.loaded = len(users) - len(missing)
+        self.update_status()
+        if missing:
+            # Активність підвантажується у фоні й з'являється в таблиці частинами
+            self.loader = UserStatsLoader(session.api, session.cache.user_stats)
+            self.loader.statsReceived.connect(self.on_stats)
+            self.loader.finished.connect(self.on_stats_finished)
+            self.loader.start(missing)
+
+    def stop_loading(self):
+        if self.loader is not None:
+            self.loader.stop()
+            self.loader = None
+
+    def set_stats(self, row, stats):
+        if stats is None:
+            values = ["…"] * 4
+        else:
+            values = [
+                str(stats["task_count"]),
+                str(stats["completed_7d"]),
+                str(stats["completed_30d"]),
+                (stats["last_active"] or "-").split("T")[0],
+            ]
+        for column, value in enumerate(values, self.STATS_COLUMN):
+            self.table.setItem(row, column, QTableWidgetItem(value))
+
+    def on_stats(self, batch):
+        # Пачки від зупиненого завантажувача могли вже стояти в черзі подій
+        if self.sender() is not self.loader:
+            return
+        self.table.setUpdatesEnabled(False)
+        for stats in batch:
+            row = self.rows.get(stats["user_id"])
+            if row is not None:
+                self.set_stats(row, stats)
+                self.loaded += 1
+        self.table.setUpdatesEnabled(True)
+        self.update_status()
+
+    def on_stats_finished(self):
+        if self.sender() is self.loader:
+            self.loader = None
+            self.update_status()
+
+    def update_status(self):
+        total = len(self.rows)
+        if self.loader is not None or self.loaded < total:
+            self.lbl_status.setText(f"Activity loaded for {self.loaded}/{total} users")
+        else:
+            self.lbl_status.setText("")
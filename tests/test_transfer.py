@@ -0,0 +1,38 @@
+import io
+
+import pytest
+
+from transfer import TransferError, read_csv, read_packed, write_csv, write_packed
+
+RECORDS = [
+    ({"id": 1, "title": "Run", "description": "5 km"}, ["2024-01-01", "2024-01-02", "2024-03-15"]),
+    ({"id": 2, "title": "Читати, \"щодня\"", "description": None}, []),
+    ({"id": 3, "title": "Leap", "description": "рядок\nдругий"}, ["2024-02-29"]),
+    ({"id": 40000, "title": "Long", "description": None}, ["2020-01-01", "2024-12-31"]),
+]
+
+
+def test_packed_round_trip():
+    fp = io.BytesIO()
+    assert write_packed(iter(RECORDS), fp) == len(RECORDS)
+    fp.seek(0)
+    assert list(read_packed(fp)) == RECORDS
+
+
+def test_csv_round_trip():
+    fp = io.StringIO(newline="")
+    assert write_csv(iter(RECORDS), fp) == len(RECORDS)
+    fp.seek(0)
+    assert list(read_csv(fp)) == RECORDS
+
+
+def test_packed_rejects_truncated_file():
+    fp = io.BytesIO()
+    write_packed(iter(RECORDS), fp)
+    with pytest.raises(TransferError):
+        list(read_packed(io.BytesIO(fp.getvalue()[:-1])))
+
+
+def test_csv_rejects_foreign_header():
+    with pytest.raises(TransferError):
+        list(read_csv(io.StringIO("a,b\n1,2\n")))
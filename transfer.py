@@ -0,0 +1,282 @@
+"""Потоковий експорт та імпорт звичок і логів у CSV та компактному бінарному форматі.
+
+Бінарний формат (.htpk): заголовок MAGIC, далі записи по одній задачі:
+id, довжини та UTF-8 тексти назви й опису, порядковий номер першого дня
+та кількість днів, після чого бітова карта виконання (1 біт на день).
+"""
+
+import csv
+import io
+import os
+import struct
+from datetime import date
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import httpx
+
+from api_client import MAX_CONCURRENT_REQUESTS, APIClient
+from cache import log_date
+
+Record = Tuple[Dict[str, Any], List[str]]
+# progress(виконано, всього); може кинути TransferError, щоб перервати передачу
+Progress = Callable[[int, int], None]
+
+CSV_SUFFIX = ".csv"
+PACKED_SUFFIX = ".htpk"
+CSV_FIELDS = ["kind", "task_id", "title", "description", "date"]
+MAGIC = b"HTPK\x01"
+RECORD_HEADER = struct.Struct(">III")
+BITMAP_HEADER = struct.Struct(">II")
+FETCH_CHUNK_SIZE = MAX_CONCURRENT_REQUESTS * 4
+SYNC_CHUNK_SIZE = 500
+
+
+class TransferError(Exception):
+    pass
+
+
+def iter_records(api: APIClient, progress: Optional[Progress] = None) -> Iterator[Record]:
+    # Логи завантажуються порціями, тож у пам'яті лише одна порція задач
+    tasks = _fetch_tasks(api)
+    done = 0
+    for start in range(0, len(tasks), FETCH_CHUNK_SIZE):
+        chunk = tasks[start:start + FETCH_CHUNK_SIZE]
+        logs = api.get_logs_for_tasks([t["id"] for t in chunk])
+        for task in chunk:
+            if task["id"] not in logs:
+                raise TransferError(f"Failed to fetch logs for '{task['title']}'")
+            dates = sorted({log_date(l) for l in logs[task["id"]] if l.get("status", True)})
+            yield task, dates
+            done += 1
+            if progress:
+                progress(done, len(tasks))
+
+
+def write_csv(records: Iterator[Record], fp: TextIO) -> int:
+    writer = csv.DictWriter(fp, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    count = 0
+    for task, dates in records:
+        writer.writerow(
+            {
+                "kind": "task",
+                "task_id": task["id"],
+                "title": task["title"],
+                "description": task.get("description") or "",
+            }
+        )
+        for d in dates:
+            writer.writerow({"kind": "log", "task_id": task["id"], "date": d})
+        count += 1
+    return count
+
+
+def read_csv(fp: TextIO) -> Iterator[Record]:
+    reader = csv.DictReader(fp)
+    missing = [f for f in CSV_FIELDS if f not in (reader.fieldnames or ())]
+    if missing:
+        raise TransferError(f"Not a HabitTasks CSV export (missing {', '.join(missing)})")
+
+    task, dates = None, []
+    for row in reader:
+        try:
+            task_id = int(row["task_id"])
+        except (TypeError, ValueError):
+            raise TransferError(f"Unexpected row: {row}") from None
+        if row["kind"] == "task":
+            if task is not None:
+                yield task, dates
+            task = {
+                "id": task_id,
+                "title": row["title"],
+                "description": row["description"] or None,
+            }
+            dates = []
+        elif row["kind"] == "log" and task is not None and task_id == task["id"]:
+            dates.append(row["date"])
+        else:
+            raise TransferError(f"Unexpected row: {row}")
+    if task is not None:
+        yield task, dates
+
+
+def write_packed(records: Iterator[Record], fp: BinaryIO) -> int:
+    fp.write(MAGIC)
+    count = 0
+    for task, dates in records:
+        title = task["title"].encode()
+        description = (task.get("description") or "").encode()
+        fp.write(RECORD_HEADER.pack(task["id"], len(title), len(description)))
+        fp.write(title)
+        fp.write(description)
+
+        days = [date.fromisoformat(d).toordinal() for d in dates]
+        first = min(days, default=0)
+        span = max(days) - first + 1 if days else 0
+        bitmap = bytearray((span + 7) // 8)
+        for day in days:
+            offset = day - first
+            bitmap[offset // 8] |= 1 << (offset % 8)
+
+        fp.write(BITMAP_HEADER.pack(first, span))
+        fp.write(bitmap)
+        count += 1
+    return count
+
+
+def read_packed(fp: BinaryIO) -> Iterator[Record]:
+    if fp.read(len(MAGIC)) != MAGIC:
+        raise TransferError("Not a HabitTasks export file")
+
+    while header := fp.read(RECORD_HEADER.size):
+        task_id, title_len, desc_len = RECORD_HEADER.unpack(_exact(header, RECORD_HEADER.size))
+        title = _exact(fp.read(title_len), title_len).decode()
+        description = _exact(fp.read(desc_len), desc_len).decode()
+        first, span = BITMAP_HEADER.unpack(
+            _exact(fp.read(BITMAP_HEADER.size), BITMAP_HEADER.size)
+        )
+        bitmap = _exact(fp.read((span + 7) // 8), (span + 7) // 8)
+
+        dates = [
+            date.fromordinal(first + offset).isoformat()
+            for offset in range(span)
+            if bitmap[offset // 8] >> (offset % 8) & 1
+        ]
+        yield {"id": task_id, "title": title, "description": description or None}, dates
+
+
+def import_records(api: APIClient, records: Iterator[Record]) -> Tuple[int, int]:
+    # Задачі зіставляються за назвою. Відсутні створюються порціями через
+    # created_tasks у /sync/, а логи відправляються порціями через new_logs
+    existing = {t["title"]: t["id"] for t in _fetch_tasks(api)}
+    new_tasks: Dict[str, Record] = {}
+    pending: List[Dict[str, Any]] = []
+    tasks_count = logs_count = 0
+
+    def queue_logs(task_id: int, dates: List[str]):
+        nonlocal logs_count
+        for d in dates:
+            pending.append({"task_id": task_id, "date": d, "status": True})
+            if len(pending) >= SYNC_CHUNK_SIZE:
+                logs_count += _flush(api, pending)
+
+    def create_new():
+        for task_id, dates in _create_tasks(api, list(new_tasks.values()), existing):
+            queue_logs(task_id, dates)
+        new_tasks.clear()
+
+    for task, dates in records:
+        tasks_count += 1
+        title = task["title"]
+        if title in existing:
+            queue_logs(existing[title], dates)
+        elif title in new_tasks:
+            new_tasks[title][1].extend(dates)
+        else:
+            new_tasks[title] = (task, list(dates))
+            if len(new_tasks) >= SYNC_CHUNK_SIZE:
+                create_new()
+
+    create_new()
+    logs_count += _flush(api, pending)
+    return tasks_count, logs_count
+
+
+def file_format(path: str, default: Optional[str] = PACKED_SUFFIX) -> Optional[str]:
+    suffix = os.path.splitext(path)[1].lower()
+    return suffix if suffix in (CSV_SUFFIX, PACKED_SUFFIX) else default
+
+
+def export_data(
+    api: APIClient, path: str, fmt: Optional[str] = None, progress: Optional[Progress] = None
+) -> int:
+    records = iter_records(api, progress)
+    try:
+        if (fmt or file_format(path)) == CSV_SUFFIX:
+            with open(path, "w", newline="", encoding="utf-8") as fp:
+                return write_csv(records, fp)
+        with open(path, "wb") as fp:
+            return write_packed(records, fp)
+    except TransferError:
+        # Перерваний експорт не залишає після себе неповний файл
+        os.remove(path)
+        raise
+
+
+def import_data(
+    api: APIClient, path: str, fmt: Optional[str] = None, progress: Optional[Progress] = None
+) -> Tuple[int, int]:
+    # Прогрес імпорту - це прочитана частина файлу, бо кількість задач
+    # наперед невідома
+    size = os.path.getsize(path)
+    with open(path, "rb") as raw:
+        if (fmt or file_format(path)) == CSV_SUFFIX:
+            records = read_csv(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+        else:
+            records = read_packed(raw)
+        if progress:
+            records = _reporting(records, lambda: progress(raw.tell(), size))
+        return import_records(api, records)
+
+
+def _reporting(records: Iterator[Record], report: Callable[[], None]) -> Iterator[Record]:
+    for record in records:
+        yield record
+        report()
+
+
+def _fetch_tasks(api: APIClient) -> List[Dict[str, Any]]:
+    # get_tasks при помилці повертає [], що дало б порожній експорт
+    # або повторне створення всіх задач при імпорті
+    try:
+        return api.fetch_tasks()
+    except httpx.HTTPError as e:
+        raise TransferError(f"Failed to fetch habits: {e}") from e
+
+
+def _create_tasks(
+    api: APIClient, records: List[Record], existing: Dict[str, int]
+) -> List[Tuple[int, List[str]]]:
+    if not records:
+        return []
+    try:
+        result = api.sync(
+            created_tasks=[
+                {"title": task["title"], "description": task.get("description")}
+                for task, _ in records
+            ]
+        )
+    except Exception as e:
+        raise TransferError(f"Failed to create habits: {e}") from e
+    for created in result.get("created_tasks") or []:
+        existing[created["title"]] = created["id"]
+
+    # Якщо сервер не повернув створені задачі, шукаємо їх у свіжому списку,
+    # а ті, яких немає і там, створюємо по одній
+    if any(task["title"] not in existing for task, _ in records):
+        existing.update((t["title"], t["id"]) for t in _fetch_tasks(api))
+    for task, _ in records:
+        if task["title"] not in existing:
+            created = api.create_task(task["title"], task.get("description"))
+            if not created:
+                raise TransferError(f"Failed to create '{task['title']}'")
+            existing[task["title"]] = created["id"]
+    return [(existing[task["title"]], dates) for task, dates in records]
+
+
+def _flush(api: APIClient, pending: List[Dict[str, Any]]) -> int:
+    if not pending:
+        return 0
+    try:
+        api.sync(new_logs=pending)
+    except Exception as e:
+        raise TransferError(f"Failed to upload logs: {e}") from e
+    count = len(pending)
+    pending.clear()
+    return count
+
+
+def _exact(data: bytes, size: int) -> bytes:
+    if len(data) != size:
+        raise TransferError("Unexpected end of file")
+    return data
@@ -0,0 +1,46 @@
+import threading
+import time
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, Signal
+
+from constants import PROGRESS_INTERVAL_MS
+from transfer import TransferError
+
+
+class TransferWorker(QObject):
+    progressChanged = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, fn: Callable[..., Any], *args, parent=None):
+        super().__init__(parent)
+        # fn - export_data або import_data, що приймають progress=
+        self.fn = fn
+        self.args = args
+        self._stopped = threading.Event()
+        self._reported = 0.0
+
+    def start(self):
+        # Експорт чи імпорт усієї історії може тривати довго, тому
+        # виконується поза GUI-потоком
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        try:
+            result = self.fn(*self.args, progress=self._progress)
+        except (TransferError, OSError, ValueError) as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(result)
+
+    def _progress(self, done: int, total: int):
+        if self._stopped.is_set():
+            raise TransferError("Cancelled")
+        now = time.monotonic()
+        if now - self._reported >= PROGRESS_INTERVAL_MS / 1000 or done >= total:
+            self._reported = now
+            self.progressChanged.emit(done, total)
@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import List
+
+import httpx
+from PySide6.QtCore import QObject, Signal
+
+from api_client import APIClient
+from cache import TTLCache
+from constants import STATS_FLUSH_INTERVAL_MS
+
+
+class UserStatsLoader(QObject):
+    statsReceived = Signal(list)
+    finished = Signal()
+
+    def __init__(self, api: APIClient, stats_cache: TTLCache, parent=None):
+        super().__init__(parent)
+        # Конкретні api/кеш сесії, а не проксі: перемикання акаунта під час
+        # завантаження не повинно змішати дані двох серверів
+        self.api = api
+        self.stats_cache = stats_cache
+        self._stopped = threading.Event()
+
+    def start(self, user_ids: List[int]):
+        thread = threading.Thread(target=self._run, args=(user_ids,), daemon=True)
+        thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self, user_ids: List[int]):
+        # Результати надсилаються пачками, щоб тисячі користувачів не
+        # перетворились на тисячі окремих перемальовувань таблиці
+        batch = []
+        flushed = time.monotonic()
+        try:
+            for stats in self.api.iter_user_stats(user_ids):
+                if self._stopped.is_set():
+                    return
+                self.stats_cache.set(stats["user_id"], stats)
+                batch.append(stats)
+                if time.monotonic() - flushed >= STATS_FLUSH_INTERVAL_MS / 1000:
+                    self.statsReceived.emit(batch)
+                    batch = []
+                    flushed = time.monotonic()
+        except httpx.HTTPError as e:
+            print(f"Failed to load user activity: {e}")
+
+        if not self._stopped.is_set():
+            if batch:
+                self.statsReceived.emit(batch)
+            self.finished.emit()